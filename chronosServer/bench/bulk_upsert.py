@@ -0,0 +1,72 @@
+"""Backfill write time: one upsert per event vs chunked save_events.
+
+Run from chronosServer/:  python -m bench.bulk_upsert [--events 500]
+
+Both paths normalize with the real CalendarSyncService and write to the
+PostgREST stand-in, which charges --latency-ms per round trip. "per-event" is
+the write sync_date_range and delta_sync used to make: one plain events upsert
+per Google event. "bulk" hands each page to save_events, which reads stored
+rows once per chunk and upserts in UPSERT_CHUNK_SIZE chunks.
+"""
+import argparse
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from bench.postgrest_standin import PostgrestStandIn, configure_environment
+
+
+def _google_events(count: int) -> list:
+    start = datetime(2026, 1, 1, 9, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        event_start = start + timedelta(hours=6 * i)
+        events.append({
+            "id": f"bench{i}",
+            "etag": f'"{i}"',
+            "status": "confirmed",
+            "summary": f"Event {i}",
+            "start": {"dateTime": event_start.isoformat()},
+            "end": {"dateTime": (event_start + timedelta(hours=1)).isoformat()},
+        })
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=250)
+    parser.add_argument("--latency-ms", type=float, default=15.0)
+    args = parser.parse_args()
+
+    with PostgrestStandIn(args.latency_ms / 1000) as standin:
+        configure_environment(standin.url)
+        from db.calendar_sync import CalendarSyncService
+        from db.supabase_client import get_supabase_client
+
+        service = CalendarSyncService(str(uuid.uuid4()), "bench@example.com", get_supabase_client())
+        calendar_id = uuid.uuid4()
+        events = _google_events(args.events)
+
+        def _per_event():
+            for event in events:
+                service.supabase.table("events").upsert(
+                    service.normalize_event(event, calendar_id),
+                    on_conflict="user_id,calendar_id,external_id"
+                ).execute()
+
+        def _bulk():
+            for offset in range(0, len(events), args.page_size):
+                service.save_events(events[offset:offset + args.page_size], calendar_id)
+
+        print(f"{'mode':<10} {'seconds':>8} {'round trips':>12}")
+        for mode, run in (("per-event", _per_event), ("bulk", _bulk)):
+            standin.reset()
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            print(f"{mode:<10} {elapsed:>8.2f} {standin.counts['requests']:>12}")
+
+
+if __name__ == "__main__":
+    main()
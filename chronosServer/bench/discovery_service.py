@@ -0,0 +1,44 @@
+"""Per-request cost of building a Calendar service object.
+
+Run from chronosServer/:  python -m bench.discovery_service [--iterations 200]
+
+"build" is the old path: googleapiclient.discovery.build for every
+GoogleCalendarService. "cached" is build_calendar_service, which binds
+credentials to a discovery document parsed once per thread. Both use the
+bundled static document, so neither touches the network.
+"""
+import argparse
+import time
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+
+def _per_call_ms(factory, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        factory()
+    return (time.perf_counter() - started) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    from db.google_credentials import build_calendar_service
+
+    credentials = Credentials(token="bench-token")
+    uncached = _per_call_ms(
+        lambda: build("calendar", "v3", credentials=credentials, cache_discovery=False, static_discovery=True),
+        args.iterations
+    )
+    build_calendar_service(credentials)
+    cached = _per_call_ms(lambda: build_calendar_service(credentials), args.iterations)
+    print(f"{'mode':<8} {'ms/service':>10}")
+    print(f"{'build':<8} {uncached:>10.2f}")
+    print(f"{'cached':<8} {cached:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
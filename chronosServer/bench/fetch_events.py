@@ -0,0 +1,75 @@
+"""Wall time of GoogleCalendarService.fetch_events vs number of calendars.
+
+Run from chronosServer/:  python -m bench.fetch_events [--calendars 1 5 10 20]
+
+Requests go through the real service objects, but each thread's transport is a
+fake Google backend that answers events.list after --latency-ms. "sequential"
+pins GOOGLE_FETCH_CONCURRENCY to 1, the old one-calendar-at-a-time loop.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+import httplib2
+from google.oauth2.credentials import Credentials
+
+
+class FakeGoogleHttp:
+    """Stands in for one thread's httplib2.Http; every call returns a page of events."""
+
+    def __init__(self, latency: float, events_per_calendar: int):
+        self.latency = latency
+        self.body = json.dumps({
+            "items": [
+                {
+                    "id": f"event{i}",
+                    "status": "confirmed",
+                    "summary": f"Event {i}",
+                    "start": {"dateTime": "2026-01-01T09:00:00Z"},
+                    "end": {"dateTime": "2026-01-01T10:00:00Z"},
+                }
+                for i in range(events_per_calendar)
+            ]
+        }).encode()
+
+    def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+        time.sleep(self.latency)
+        return httplib2.Response({"status": "200", "content-type": "application/json"}), self.body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calendars", type=int, nargs="+", default=[1, 5, 10, 20])
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--events", type=int, default=25)
+    args = parser.parse_args()
+
+    # Keep the account rate limiter out of the measurement.
+    os.environ.setdefault("GOOGLE_RATE_LIMIT_PER_SECOND", "1000")
+    os.environ.setdefault("GOOGLE_RATE_LIMIT_BURST", "1000")
+    import db.google_credentials as google_credentials
+    from config import settings
+
+    google_credentials._get_thread_http = lambda: FakeGoogleHttp(args.latency_ms / 1000, args.events)
+    concurrency = settings.GOOGLE_FETCH_CONCURRENCY
+
+    print(f"{'calendars':>9} {'sequential s':>13} {'concurrent s':>13}")
+    for count in args.calendars:
+        calendar_ids = [f"calendar{i}@group.calendar.google.com" for i in range(count)]
+        timings = []
+        for workers in (1, concurrency):
+            settings.GOOGLE_FETCH_CONCURRENCY = workers
+            service = google_credentials.GoogleCalendarService("bench-user", None, "bench@example.com")
+            service.credentials = Credentials(token="bench-token", expiry=datetime.utcnow() + timedelta(hours=1))
+            started = time.perf_counter()
+            events = service.fetch_events("2026-01-01T00:00:00Z", "2026-02-01T00:00:00Z", calendar_ids)
+            timings.append(time.perf_counter() - started)
+            assert len(events) == count * args.events
+        print(f"{count:>9} {timings[0]:>13.2f} {timings[1]:>13.2f}")
+    settings.GOOGLE_FETCH_CONCURRENCY = concurrency
+
+
+if __name__ == "__main__":
+    main()
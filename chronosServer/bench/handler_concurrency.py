@@ -0,0 +1,83 @@
+"""Throughput vs concurrent clients for blocking handlers on one event loop.
+
+Run from chronosServer/:  python -m bench.handler_concurrency [--requests 1000]
+
+"async" is the old handler shape: `async def` calling the sync Supabase client,
+which stalls the loop for every round trip. "threadpool" is the shape the
+routers use now: a plain `def` handler that FastAPI runs in the threadpool
+sized by API_THREADPOOL_SIZE (set in main.lifespan). "connections" is how many
+PostgREST connections the threadpool run opened; it stays under
+SUPABASE_POOL_MAX_CONNECTIONS. The client, app and stand-in share one process,
+so once it saturates a core, throughput is CPU-bound rather than I/O-bound.
+"""
+import argparse
+import asyncio
+import time
+
+import anyio.to_thread
+import httpx
+from fastapi import FastAPI
+
+from bench.postgrest_standin import PostgrestStandIn, configure_environment
+
+
+def _build_app(get_supabase_client) -> FastAPI:
+    app = FastAPI()
+
+    def _query():
+        return get_supabase_client().table("events").select("id").eq("user_id", "bench").execute().data
+
+    @app.get("/async")
+    async def blocking_in_loop():
+        return _query()
+
+    @app.get("/threadpool")
+    def offloaded():
+        return _query()
+
+    return app
+
+
+async def _run(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def _call():
+            async with semaphore:
+                (await client.get(path)).raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_call() for _ in range(requests)))
+        return time.perf_counter() - started
+
+
+async def _main(args, standin):
+    from config import settings
+    from db.supabase_client import get_supabase_client
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.API_THREADPOOL_SIZE
+    app = _build_app(get_supabase_client)
+    print(f"{'clients':>8} {'async req/s':>12} {'threadpool req/s':>17} {'connections':>12}")
+    for concurrency in args.concurrency:
+        rates = []
+        for path in ("/async", "/threadpool"):
+            standin.reset()
+            elapsed = await _run(app, path, args.requests, concurrency)
+            rates.append(args.requests / elapsed)
+        print(f"{concurrency:>8} {rates[0]:>12.1f} {rates[1]:>17.1f} {standin.counts['connections']:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    with PostgrestStandIn(args.latency_ms / 1000) as standin:
+        configure_environment(standin.url)
+        asyncio.run(_main(args, standin))
+
+
+if __name__ == "__main__":
+    main()
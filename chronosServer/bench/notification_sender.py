@@ -0,0 +1,145 @@
+"""Fake Google push sender: bursts of notifications vs delta syncs actually run.
+
+Run from chronosServer/:  python -m bench.notification_sender [--channels 3] [--burst 20] [--bursts 2]
+
+By default the real /calendar/notifications route is driven in-process over
+httpx's ASGI transport. Fake channels are seeded into the channel cache, and
+the targeted delta sync is replaced by a counter. Each channel gets a "sync"
+handshake and then --bursts bursts of --burst "exists" notifications, sent
+--gap-ms apart. Every burst should collapse into one sync of that channel's
+calendar.
+
+With --url the same bursts go to a running server for one real channel
+(--channel-id/--token/--resource-id). The outcomes are printed, and the
+server log shows the syncs.
+"""
+import argparse
+import asyncio
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+
+import httpx
+
+
+def _headers(channel: dict, state: str, number: int) -> dict:
+    headers = {
+        "X-Goog-Channel-ID": channel["channel_id"],
+        "X-Goog-Channel-Token": channel["token"],
+        "X-Goog-Resource-State": state,
+        "X-Goog-Message-Number": str(number),
+    }
+    if channel.get("resource_id"):
+        headers["X-Goog-Resource-ID"] = channel["resource_id"]
+    return headers
+
+
+async def _send_bursts(client: httpx.AsyncClient, channels: list, args) -> Counter:
+    outcomes = Counter()
+
+    async def _post(channel, state, number):
+        response = await client.post("/calendar/notifications", headers=_headers(channel, state, number))
+        outcomes[response.json().get("status") or response.status_code] += 1
+
+    async def _burst(channel, first_number):
+        for offset in range(args.burst):
+            await _post(channel, "exists", first_number + offset)
+            await asyncio.sleep(args.gap_ms / 1000)
+
+    for channel in channels:
+        await _post(channel, "sync", 1)
+    for index in range(args.bursts):
+        if index:
+            # Quiet long enough for the previous burst's debounce timer to fire.
+            await asyncio.sleep(args.debounce + 0.5)
+        await asyncio.gather(*(_burst(channel, 2 + index * args.burst) for channel in channels))
+    return outcomes
+
+
+def _fake_channels(count: int) -> list:
+    return [
+        {
+            "channel_id": str(uuid.uuid4()),
+            "token": f"bench-token-{i}",
+            "resource_id": f"resource-{i}",
+            "user_id": str(uuid.uuid4()),
+            "external_account_id": "bench@example.com",
+            "calendar_id": str(uuid.uuid4()),
+            "provider_calendar_id": f"calendar{i}@group.calendar.google.com",
+            "expiration": None,
+        }
+        for i in range(count)
+    ]
+
+
+async def _run_in_process(args) -> None:
+    os.environ.setdefault("VITE_SUPABASE_URL", "http://127.0.0.1:9")
+    os.environ.setdefault("VITE_SUPABASE_SERVICE_ROLE_KEY", "bench.service.key")
+    os.environ["GOOGLE_WATCH_DEBOUNCE_SECONDS"] = str(args.debounce)
+    import db.watch_channels as watch_channels
+    from fastapi import FastAPI
+    from endpoints.calendar import router
+
+    channels = _fake_channels(args.channels)
+    with watch_channels._channel_cache_lock:
+        watch_channels._channel_cache.update({channel["channel_id"]: channel for channel in channels})
+
+    syncs = Counter()
+    syncs_lock = threading.Lock()
+
+    def _count_sync(channel):
+        with syncs_lock:
+            syncs[channel["provider_calendar_id"]] += 1
+        return {"status": "completed"}
+
+    watch_channels._sync_watched_calendar = _count_sync
+
+    app = FastAPI()
+    app.include_router(router)
+    transport = httpx.ASGITransport(app=app)
+    started = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        outcomes = await _send_bursts(client, channels, args)
+    elapsed = time.perf_counter() - started
+    # Let the last debounce timers fire and their scheduler jobs finish.
+    await asyncio.sleep(args.debounce + 1)
+
+    print(f"sent {sum(outcomes.values())} notifications in {elapsed:.2f}s: {dict(outcomes)}")
+    print(f"{'calendar':<40} {'bursts':>6} {'notifications':>13} {'syncs':>6}")
+    for channel in channels:
+        calendar = channel["provider_calendar_id"]
+        print(f"{calendar:<40} {args.bursts:>6} {args.bursts * args.burst:>13} {syncs[calendar]:>6}")
+
+
+async def _run_remote(args) -> None:
+    channel = {"channel_id": args.channel_id, "token": args.token, "resource_id": args.resource_id}
+    async with httpx.AsyncClient(base_url=args.url) as client:
+        outcomes = await _send_bursts(client, [channel], args)
+    print(f"sent {sum(outcomes.values())} notifications: {dict(outcomes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, default=3)
+    parser.add_argument("--burst", type=int, default=20, help="notifications per burst")
+    parser.add_argument("--bursts", type=int, default=2, help="bursts per channel, spaced past the debounce")
+    parser.add_argument("--gap-ms", type=float, default=20.0)
+    parser.add_argument("--debounce", type=float, default=1.0, help="debounce in seconds; set for the in-process run, match the server's GOOGLE_WATCH_DEBOUNCE_SECONDS with --url")
+    parser.add_argument("--url", help="base URL of a running server, e.g. http://localhost:8000")
+    parser.add_argument("--channel-id")
+    parser.add_argument("--token")
+    parser.add_argument("--resource-id")
+    args = parser.parse_args()
+
+    if args.url:
+        if not (args.channel_id and args.token):
+            parser.error("--url needs --channel-id and --token")
+        asyncio.run(_run_remote(args))
+    else:
+        asyncio.run(_run_in_process(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Requests per second with a fresh Supabase client per request vs the pooled client.
+
+Run from chronosServer/:  python -m bench.pooled_client [--requests 400] [--threads 8]
+
+"per-request" rebuilds the client for every call, as get_supabase_client did
+before pooling; "pooled" goes through get_supabase_client. The stand-in
+charges --connect-ms for every new connection to emulate the TLS handshake.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench.postgrest_standin import PostgrestStandIn, configure_environment
+
+
+def _run(get_client, requests: int, threads: int) -> float:
+    def _call(_):
+        get_client().table("events").select("id").eq("user_id", "bench").limit(1).execute()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(_call, range(requests)))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--connect-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    with PostgrestStandIn(args.latency_ms / 1000, args.connect_ms / 1000) as standin:
+        configure_environment(standin.url)
+        from db.supabase_client import create_supabase_client, get_supabase_client
+
+        print(f"{'mode':<12} {'req/s':>8} {'connections':>12}")
+        for mode, get_client in (("per-request", create_supabase_client), ("pooled", get_supabase_client)):
+            standin.reset()
+            elapsed = _run(get_client, args.requests, args.threads)
+            print(f"{mode:<12} {args.requests / elapsed:>8.1f} {standin.counts['connections']:>12}")
+
+
+if __name__ == "__main__":
+    main()
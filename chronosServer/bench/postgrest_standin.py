@@ -0,0 +1,97 @@
+"""Local PostgREST stand-in for the benchmarks in this directory.
+
+Answers reads with an empty result and echoes written rows back, after a fixed
+per-request latency. New connections pay an extra setup cost to stand in for
+the TCP/TLS handshake against a hosted PostgREST.
+"""
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as separate writes; without this, delayed ACKs stall each response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.record(connections=1)
+        time.sleep(self.server.connect_cost)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, rows):
+        body = json.dumps(rows).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_rows(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"[]") if length else []
+        return payload if isinstance(payload, list) else [payload]
+
+    def do_GET(self):
+        self.server.record(requests=1)
+        time.sleep(self.server.latency)
+        self._respond([])
+
+    def do_HEAD(self):
+        self.do_GET()
+
+    def _write(self):
+        rows = self._read_rows()
+        self.server.record(requests=1, rows=len(rows))
+        time.sleep(self.server.latency)
+        self._respond(rows)
+
+    do_POST = _write
+    do_PATCH = _write
+    do_DELETE = _write
+
+
+class PostgrestStandIn(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs when a pool opens many connections at once.
+    request_queue_size = 1024
+
+    def __init__(self, latency: float = 0.005, connect_cost: float = 0.0):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.latency = latency
+        self.connect_cost = connect_cost
+        self._lock = threading.Lock()
+        self.counts = {"connections": 0, "requests": 0, "rows": 0}
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self.counts[key] += value
+
+    def reset(self):
+        with self._lock:
+            self.counts = dict.fromkeys(self.counts, 0)
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+
+def configure_environment(url: str) -> None:
+    """Point config.settings at the stand-in; call before importing anything from db/."""
+    import os
+    os.environ["VITE_SUPABASE_URL"] = url
+    os.environ["VITE_SUPABASE_SERVICE_ROLE_KEY"] = "bench.service.key"
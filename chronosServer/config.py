@@ -15,6 +15,43 @@ class Settings:
     GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
     CEREBRAS_API_KEY: str = os.getenv("CEREBRAS_KEY", "")
     CEREBRAS_MODEL: str = os.getenv("CEREBRAS_MODEL", "")
+    SUPABASE_POOL_MAX_AGE_SECONDS: int = int(os.getenv("SUPABASE_POOL_MAX_AGE_SECONDS", "900"))
+    SUPABASE_POOL_IDLE_SECONDS: int = int(os.getenv("SUPABASE_POOL_IDLE_SECONDS", "60"))
+    SUPABASE_POOL_MAX_CONNECTIONS: int = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", os.getenv("API_THREADPOOL_SIZE", "200")))
+    SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
+    AUTH_JWKS_TTL_SECONDS: int = int(os.getenv("AUTH_JWKS_TTL_SECONDS", "600"))
+    AUTH_TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_TOKEN_CACHE_TTL_SECONDS", "60"))
+    AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "2048"))
+    GOOGLE_CREDENTIAL_CACHE_TTL_SECONDS: int = int(os.getenv("GOOGLE_CREDENTIAL_CACHE_TTL_SECONDS", "900"))
+    GOOGLE_FETCH_CONCURRENCY: int = int(os.getenv("GOOGLE_FETCH_CONCURRENCY", "4"))
+    RECURRENCE_WINDOW_PAST_DAYS: int = int(os.getenv("RECURRENCE_WINDOW_PAST_DAYS", "90"))
+    RECURRENCE_WINDOW_FUTURE_DAYS: int = int(os.getenv("RECURRENCE_WINDOW_FUTURE_DAYS", "365"))
+    RECURRENCE_COVERAGE_TTL_SECONDS: int = int(os.getenv("RECURRENCE_COVERAGE_TTL_SECONDS", "300"))
+    RECURRENCE_MAX_INSTANCES: int = int(os.getenv("RECURRENCE_MAX_INSTANCES", "500"))
+    SYNC_MAX_WORKERS: int = int(os.getenv("SYNC_MAX_WORKERS", "4"))
+    SYNC_INTERACTIVE_WORKERS: int = int(os.getenv("SYNC_INTERACTIVE_WORKERS", "2"))
+    SYNC_FOREGROUND_TIMEOUT_SECONDS: float = float(os.getenv("SYNC_FOREGROUND_TIMEOUT_SECONDS", "120"))
+    SYNC_GLOBAL_CONCURRENCY: int = int(os.getenv("SYNC_GLOBAL_CONCURRENCY", "16"))
+    SYNC_PER_ACCOUNT_CONCURRENCY: int = int(os.getenv("SYNC_PER_ACCOUNT_CONCURRENCY", "4"))
+    SYNC_WINDOW_CONCURRENCY: int = int(os.getenv("SYNC_WINDOW_CONCURRENCY", "4"))
+    SYNC_MAX_INFLIGHT_PAGES: int = int(os.getenv("SYNC_MAX_INFLIGHT_PAGES", "2"))
+    SYNC_SHARED_CALENDARS: bool = os.getenv("SYNC_SHARED_CALENDARS", "false").lower() == "true"
+    SYNC_SHARED_FRESH_SECONDS: int = int(os.getenv("SYNC_SHARED_FRESH_SECONDS", "60"))
+    SYNC_WINDOW_TARGET_EVENTS: int = int(os.getenv("SYNC_WINDOW_TARGET_EVENTS", "250"))
+    SYNC_WINDOW_MIN_DAYS: int = int(os.getenv("SYNC_WINDOW_MIN_DAYS", "7"))
+    SYNC_WINDOW_MAX_DAYS: int = int(os.getenv("SYNC_WINDOW_MAX_DAYS", "366"))
+    GOOGLE_RATE_LIMIT_PER_SECOND: float = float(os.getenv("GOOGLE_RATE_LIMIT_PER_SECOND", "10"))
+    GOOGLE_RATE_LIMIT_BURST: int = int(os.getenv("GOOGLE_RATE_LIMIT_BURST", "20"))
+    GOOGLE_RATE_LIMIT_RETRIES: int = int(os.getenv("GOOGLE_RATE_LIMIT_RETRIES", "5"))
+    GOOGLE_BACKOFF_BASE_SECONDS: float = float(os.getenv("GOOGLE_BACKOFF_BASE_SECONDS", "1"))
+    GOOGLE_BACKOFF_MAX_SECONDS: float = float(os.getenv("GOOGLE_BACKOFF_MAX_SECONDS", "32"))
+    GOOGLE_WEBHOOK_URL: str = os.getenv("GOOGLE_WEBHOOK_URL", "")
+    GOOGLE_WATCH_TTL_SECONDS: int = int(os.getenv("GOOGLE_WATCH_TTL_SECONDS", "604800"))
+    GOOGLE_WATCH_RENEWAL_MARGIN_SECONDS: int = int(os.getenv("GOOGLE_WATCH_RENEWAL_MARGIN_SECONDS", "86400"))
+    GOOGLE_WATCH_RENEWAL_INTERVAL_SECONDS: int = int(os.getenv("GOOGLE_WATCH_RENEWAL_INTERVAL_SECONDS", "3600"))
+    GOOGLE_WATCH_DEBOUNCE_SECONDS: float = float(os.getenv("GOOGLE_WATCH_DEBOUNCE_SECONDS", "5"))
+    GOOGLE_WATCH_FALLBACK_SYNC_SECONDS: int = int(os.getenv("GOOGLE_WATCH_FALLBACK_SYNC_SECONDS", "3600"))
+    API_THREADPOOL_SIZE: int = int(os.getenv("API_THREADPOOL_SIZE", "200"))
     
 
 settings = Settings()
@@ -1,5 +1,7 @@
 from fastapi import Request, HTTPException, Depends, status
+from starlette.concurrency import run_in_threadpool
 from db.supabase_client import get_supabase_client
+from db.token_verifier import verify_access_token, unverified_expiry, verified_tokens, InvalidToken, LocalVerificationUnavailable
 from supabase import Client
 from models.user import User
 import logging
@@ -42,12 +44,31 @@ async def get_current_user(
             headers={"X-Auth-Required": "true"}
         )
 
+    cached_user = verified_tokens.get(access_token)
+    if cached_user:
+        return cached_user
+
+    try:
+        user, token_exp = await verify_access_token(access_token)
+        verified_tokens.put(access_token, user, token_exp)
+        return user
+    except InvalidToken:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"X-Token-Expired": "true"}
+        )
+    except LocalVerificationUnavailable:
+        pass
+
     try:
-        supabase_user = supabase.auth.get_user(access_token).user
-        return _build_user(supabase_user)
+        supabase_user = (await run_in_threadpool(supabase.auth.get_user, access_token)).user
+        user = _build_user(supabase_user)
     except Exception as error:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
             headers={"X-Token-Expired": "true"}
         )
+    verified_tokens.put(access_token, user, unverified_expiry(access_token))
+    return user
@@ -0,0 +1,24 @@
+from fastapi import Request, HTTPException, status
+from starlette.requests import ClientDisconnect
+
+
+async def get_json_body(request: Request) -> dict:
+    """Read the JSON body on the event loop so handlers can run in the threadpool."""
+    try:
+        body = await request.json()
+    except ClientDisconnect:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Client disconnected")
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON")
+    return body
+
+
+async def get_optional_json_body(request: Request) -> dict:
+    """Like get_json_body, but an empty or malformed body yields {}."""
+    try:
+        body = await request.json()
+    except Exception:
+        return {}
+    return body if isinstance(body, dict) else {}
@@ -1,15 +1,336 @@
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 from typing import Optional, Dict, Any
 from uuid import UUID
 from supabase import Client
 from fastapi import HTTPException, status
-from dateutil.rrule import rrulestr
-from db.google_credentials import GoogleCalendarService
+from config import settings
+from db.google_credentials import EVENT_LIST_FIELDS, GoogleCalendarService, thread_bytes_received
+from db.recurrence import default_expansion_window, expand_occurrences, parse_timestamp, timestamp_key
 
 logger = logging.getLogger(__name__)
 
+UPSERT_CHUNK_SIZE = 200
+CHANGE_FEED_TABLE = "event_changes"
+EVENT_KEY_COLUMNS = ("user_id", "calendar_id", "external_id")
+# The insert half of an upsert is checked against NOT NULL before the conflict
+# resolves to an update, so partial rows always carry these.
+EVENT_REQUIRED_COLUMNS = ("start_ts", "end_ts", "status")
+# Bookkeeping columns are written when they differ but never reported as changes.
+CHANGE_FEED_IGNORED_COLUMNS = {"etag", "last_modified_at"}
+ETAG_PAGE_SIZE = 1000
+BACKFILL_STAGE_RADII_MONTHS = (0, 3)
+DEFAULT_WINDOW_DAYS = 31
+RECURRENCE_COVERAGE_MAX_USERS = 4096
+
+_global_sync_slots = threading.BoundedSemaphore(settings.SYNC_GLOBAL_CONCURRENCY)
+# Long-lived page fetchers, so each keeps its thread-local Google service and
+# transport (and TLS connection) across windows and syncs. Every sync holds a
+# global slot and runs at most SYNC_WINDOW_CONCURRENCY windows, so producers never queue.
+_page_fetchers = ThreadPoolExecutor(
+    max_workers=settings.SYNC_GLOBAL_CONCURRENCY * max(1, settings.SYNC_WINDOW_CONCURRENCY),
+    thread_name_prefix="sync-page-fetch"
+)
+_account_sync_slots: Dict[tuple, threading.BoundedSemaphore] = {}
+_account_sync_slots_lock = threading.Lock()
+
+
+def _same_column_value(column: str, stored, incoming) -> bool:
+    if column.endswith("_ts") or column.endswith("_at"):
+        return timestamp_key(stored) == timestamp_key(incoming)
+    return stored == incoming
+
+
+def _shift_months(moment: datetime, months: int) -> datetime:
+    """First instant of the month `months` away from `moment`'s month (UTC)."""
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _merge_spans(spans) -> list:
+    """Sort and merge [start, end) spans; spans within a second of each other join."""
+    merged = []
+    for start, end in sorted(span for span in spans if span[0] and span[1]):
+        if merged and start <= merged[-1][1] + timedelta(seconds=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract_spans(spans: list, covered: list) -> list:
+    """Parts of `spans` not covered by any span in `covered`."""
+    remaining = []
+    covered = _merge_spans(covered)
+    for start, end in spans:
+        cursor = start
+        for covered_start, covered_end in covered:
+            if covered_end <= cursor or covered_start >= end:
+                continue
+            if covered_start > cursor:
+                remaining.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            remaining.append((cursor, end))
+    return remaining
+
+
+class RecurrenceCoverage:
+    """Per-user spans beyond the default window whose instances have been materialized.
+
+    A span is recorded only after its expansion job succeeds, and a user's spans
+    are dropped whenever a sync prunes instances outside the default window.
+    Entries expire after RECURRENCE_COVERAGE_TTL_SECONDS so a prune in another
+    worker process is picked up; re-expanding a covered span is a no-op diff.
+    """
+
+    def __init__(self, ttl_seconds: float, max_users: int = RECURRENCE_COVERAGE_MAX_USERS):
+        self._ttl = ttl_seconds
+        self._max_users = max_users
+        self._lock = threading.Lock()
+        self._spans: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    def missing(self, user_id: str, start: datetime, end: datetime) -> list:
+        """Parts of [start, end) outside both the default window and recorded spans."""
+        window_start, window_end = default_expansion_window()
+        with self._lock:
+            entry = self._spans.get(user_id)
+            if entry and time.monotonic() - entry[0] > self._ttl:
+                self._spans.pop(user_id, None)
+                entry = None
+            spans = entry[1] if entry else []
+        return _subtract_spans([(start, end)], [(window_start, window_end), *spans])
+
+    def generation(self, user_id: str) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def add(self, user_id: str, start: datetime, end: datetime, generation: int) -> bool:
+        """Record a span expanded since `generation`; ignored if a prune happened meanwhile."""
+        with self._lock:
+            if self._generations.get(user_id, 0) != generation:
+                return False
+            entry = self._spans.pop(user_id, None)
+            spans = entry[1] if entry else []
+            self._spans[user_id] = (time.monotonic(), _merge_spans([*spans, (start, end)]))
+            while len(self._spans) > self._max_users:
+                self._spans.popitem(last=False)
+            return True
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._spans.pop(user_id, None)
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+
+
+recurrence_coverage = RecurrenceCoverage(settings.RECURRENCE_COVERAGE_TTL_SECONDS)
+
+
+def prefetch_pages(pages, transfer: Optional[dict] = None):
+    """Run a page iterator on a shared fetcher thread with at most SYNC_MAX_INFLIGHT_PAGES buffered.
+
+    The caller writes page N while page N+1 is fetched; a slow writer blocks the
+    fetcher, so memory stays bounded by the buffer. Response bytes read by the
+    producer are added to `transfer["bytes_received"]`.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, settings.SYNC_MAX_INFLIGHT_PAGES))
+    stopped = threading.Event()
+
+    def _put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        bytes_before = thread_bytes_received()
+        error = None
+        try:
+            for page in pages:
+                if not _put(("page", page)):
+                    return
+        except Exception as e:
+            error = e
+        finally:
+            if transfer is not None:
+                transfer["bytes_received"] = transfer.get("bytes_received", 0) + thread_bytes_received() - bytes_before
+        _put(("end", error))
+
+    producer = _page_fetchers.submit(_produce)
+    try:
+        while True:
+            kind, payload = buffer.get()
+            if kind == "page":
+                yield payload
+                continue
+            if payload is not None:
+                raise payload
+            break
+    finally:
+        # Unblock the producer if the consumer stops early, then wait for its byte count.
+        stopped.set()
+        producer.result()
+
+
+@contextmanager
+def google_sync_slot(user_id: str, external_account_id: Optional[str]):
+    """Bound concurrent Google sync work per account (quota is per user) and process-wide."""
+    with _account_sync_slots_lock:
+        account_slots = _account_sync_slots.setdefault(
+            (user_id, external_account_id),
+            threading.BoundedSemaphore(settings.SYNC_PER_ACCOUNT_CONCURRENCY)
+        )
+    # Take the account slot first so a busy account never parks global capacity.
+    with account_slots:
+        with _global_sync_slots:
+            yield
+
+
+class RangeCheckpoint:
+    """Progress of a range sync, persisted in event_sync_state.backfill_progress when enabled.
+
+    Completed spans are kept merged as [start, end) pairs. In-flight windows keep
+    their span and the page token of their next unread page. The first sync
+    token issued is kept across restarts, and observed event density sizes the
+    windows planned next.
+    """
+
+    def __init__(self, service: "CalendarSyncService", calendar_id: UUID, enabled: bool):
+        self._service = service
+        self._calendar_id = str(calendar_id)
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        state = service.sync_state(calendar_id) if enabled else {}
+        progress = state.get("backfill_progress") or {}
+        completed = progress.get("completed") or []
+        if isinstance(completed, dict):
+            completed = list(completed.values())
+        self.completed = _merge_spans(
+            (parse_timestamp(start), parse_timestamp(end)) for start, end in completed
+        )
+        self.in_flight: Dict[str, dict] = progress.get("in_flight") or {}
+        self.sync_token: Optional[str] = progress.get("sync_token")
+        self.observed_events: int = progress.get("observed_events") or 0
+        self.observed_days: float = progress.get("observed_days") or 0.0
+        self.before_ts = parse_timestamp(state.get("backfill_before_ts"))
+        self.after_ts = parse_timestamp(state.get("backfill_after_ts"))
+
+    def window_days(self) -> float:
+        """Span that should hold about one page of events at the observed density."""
+        if not self.observed_days:
+            return DEFAULT_WINDOW_DAYS
+        per_day = self.observed_events / self.observed_days
+        if per_day <= 0:
+            return settings.SYNC_WINDOW_MAX_DAYS
+        days = settings.SYNC_WINDOW_TARGET_EVENTS / per_day
+        return min(settings.SYNC_WINDOW_MAX_DAYS, max(settings.SYNC_WINDOW_MIN_DAYS, days))
+
+    def plan(self, start_date: datetime, end_date: datetime) -> list:
+        """Windows still to sync: interrupted windows first, then uncovered gaps sliced by density."""
+        windows = []
+        for key, entry in self.in_flight.items():
+            window = (parse_timestamp(key), parse_timestamp(entry.get("end")))
+            if window[0] and window[1] and start_date <= window[0] and window[1] <= end_date:
+                windows.append(window)
+
+        step = timedelta(days=self.window_days())
+        for gap_start, gap_end in _subtract_spans([(start_date, end_date)], self.completed + windows):
+            current = gap_start
+            while current < gap_end:
+                window_end = min(current + step, gap_end)
+                # Fold a short tail into this window rather than spending a call on it.
+                if gap_end - window_end < step / 2:
+                    window_end = gap_end
+                windows.append((current, window_end))
+                current = window_end
+        return windows
+
+    def resume_token(self, window_start: datetime, window_end: datetime) -> Optional[str]:
+        entry = self.in_flight.get(window_start.isoformat()) or {}
+        if parse_timestamp(entry.get("end")) != window_end:
+            return None
+        return entry.get("page_token")
+
+    def page_done(self, window_start: datetime, window_end: datetime, next_page_token: str) -> None:
+        with self._lock:
+            self.in_flight[window_start.isoformat()] = {"end": window_end.isoformat(), "page_token": next_page_token}
+            self._write()
+
+    def window_done(self, window_start: datetime, window_end: datetime, sync_token: Optional[str], event_count: int) -> None:
+        with self._lock:
+            self.completed = _merge_spans(self.completed + [(window_start, window_end)])
+            self.in_flight.pop(window_start.isoformat(), None)
+            if sync_token and not self.sync_token:
+                self.sync_token = sync_token
+            self.observed_events += event_count
+            self.observed_days += (window_end - window_start).total_seconds() / 86400
+            self._extend_coverage()
+            self._write(with_coverage=True)
+
+    def finish(self) -> None:
+        """Drop persisted progress once every window has completed."""
+        with self._lock:
+            self.completed, self.in_flight = [], {}
+            if self._enabled:
+                try:
+                    self._upsert({"backfill_progress": None})
+                except Exception as e:
+                    logger.warning("Failed to clear backfill progress for calendar %s: %s", self._calendar_id, e)
+
+    def _extend_coverage(self) -> None:
+        # Coverage only grows over the unbroken completed span around now.
+        now = datetime.now(timezone.utc)
+        span = next(((start, end) for start, end in self.completed if start <= now < end), None)
+        if span is None:
+            return
+        self.before_ts = min(self.before_ts, span[0]) if self.before_ts else span[0]
+        self.after_ts = max(self.after_ts, span[1]) if self.after_ts else span[1]
+
+    def _write(self, with_coverage: bool = False) -> None:
+        if not self._enabled:
+            return
+        payload = {
+            "backfill_progress": {
+                "completed": [[start.isoformat(), end.isoformat()] for start, end in self.completed],
+                "in_flight": self.in_flight,
+                "sync_token": self.sync_token,
+                "observed_events": self.observed_events,
+                "observed_days": self.observed_days,
+            }
+        }
+        coverage = {}
+        if with_coverage and self.before_ts and self.after_ts:
+            coverage = {
+                "backfill_before_ts": self.before_ts.isoformat(),
+                "backfill_after_ts": self.after_ts.isoformat(),
+            }
+        try:
+            self._upsert({**payload, **coverage})
+        except Exception as e:
+            # Without the backfill_progress column (migration 006) the run goes on uncheckpointed.
+            logger.warning("Backfill checkpointing disabled for calendar %s: %s", self._calendar_id, e)
+            self._enabled = False
+            if coverage:
+                self._upsert(coverage)
+
+    def _upsert(self, payload: dict) -> None:
+        self._service.supabase.table("event_sync_state").upsert(
+            {"user_id": self._service.user_id, "calendar_id": self._calendar_id, **payload},
+            on_conflict="user_id,calendar_id"
+        ).execute()
+
+
 class CalendarSyncService:
     def __init__(self, user_id: str, external_account_id: str, supabase: Client):
         self.user_id = user_id
@@ -17,54 +338,146 @@ class CalendarSyncService:
         self.supabase = supabase
         self.google_service = GoogleCalendarService(user_id, supabase, external_account_id)
     
-    def get_calendar_id(self, google_calendar: Dict[str, Any]) -> UUID:
-        google_calendar_id = google_calendar.get("id")
-        provider_color = google_calendar.get("backgroundColor", "#4285f4")
-        result = (
+    def sync_calendar_list(self) -> Dict[str, Any]:
+        """Mirror the account's calendarList into connected_calendars.
+
+        Only entries changed since the stored calendarList sync token are fetched
+        (a full listing when there is none), new rows are inserted in one call and
+        changed rows are upserted in bulk on their id; a user-chosen color is never
+        overwritten. Calendars deleted or hidden in Google are marked hidden.
+        Returns the Google entries fetched, (calendar_id, provider_calendar_id)
+        targets for every visible calendar on the account, and the stored
+        primary calendar id.
+        """
+        account_query = (
+            self.supabase.table("calendar_accounts")
+            .select("calendar_list_sync_token")
+            .eq("user_id", self.user_id)
+            .eq("provider", "google")
+        )
+        if self.external_account_id:
+            account_query = account_query.eq("external_account_id", self.external_account_id)
+        try:
+            account_rows = account_query.execute().data or []
+        except Exception as e:
+            # Without the token column every listing is a full one, as before.
+            logger.warning("Calendar list sync token unavailable for %s: %s", self.user_id, e)
+            account_rows = []
+        calendars_query = (
             self.supabase.table("connected_calendars")
-            .select("id,color")
+            .select("id,provider_calendar_id,color,etag,hidden,is_primary")
             .eq("user_id", self.user_id)
-            .eq("external_account_id", self.external_account_id)
-            .eq("provider_calendar_id", google_calendar_id)
-            .execute()
         )
+        if self.external_account_id:
+            calendars_query = calendars_query.eq("external_account_id", self.external_account_id)
+        else:
+            calendars_query = calendars_query.is_("external_account_id", "null")
+        existing = {
+            row["provider_calendar_id"]: row
+            for row in calendars_query.execute().data or []
+            if row.get("provider_calendar_id")
+        }
+        # Without stored rows the delta since the last token would miss calendars.
+        sync_token = account_rows[0].get("calendar_list_sync_token") if account_rows and existing else None
+        changes = self.google_service.list_calendar_changes(sync_token)
+
+        listed = set()
+        removed = set()
+        rows_by_columns: Dict[tuple, list] = {}
+        new_rows = []
+        now_iso = datetime.now(timezone.utc).isoformat()
+        for google_calendar in changes["items"]:
+            google_calendar_id = google_calendar.get("id")
+            if not google_calendar_id:
+                continue
+            if google_calendar.get("deleted") or google_calendar.get("hidden"):
+                removed.add(google_calendar_id)
+                continue
+            listed.add(google_calendar_id)
+            current = existing.get(google_calendar_id)
+            if (
+                current and current.get("color") and not current.get("hidden")
+                and bool(current.get("is_primary")) == bool(google_calendar.get("primary"))
+                and current.get("etag") and current["etag"] == google_calendar.get("etag")
+            ):
+                continue
 
-        if result.data:
-            calendar_id = UUID(result.data[0]["id"])
-            existing_color = result.data[0].get("color")
-            update_data = {
-                "summary": google_calendar.get("summary"),
+            provider_color = google_calendar.get("backgroundColor", "#4285f4")
+            row = {
+                "user_id": self.user_id,
+                "external_account_id": self.external_account_id,
+                "provider_calendar_id": google_calendar_id,
+                "summary": google_calendar.get("summary", ""),
                 "provider_color": provider_color,
-                "access_role": google_calendar.get("accessRole"),
+                "access_role": google_calendar.get("accessRole", "reader"),
                 "etag": google_calendar.get("etag"),
-                "external_account_id": self.external_account_id,
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "hidden": False,
+                "is_primary": bool(google_calendar.get("primary")),
+                "updated_at": now_iso
             }
-            if not existing_color:
-                update_data["color"] = provider_color
-            self.supabase.table("connected_calendars").update(update_data).eq("id", str(calendar_id)).execute()
-            return calendar_id
-        
-        new_calendar = {
-            "user_id": self.user_id,
-            "external_account_id": self.external_account_id,
-            "provider_calendar_id": google_calendar_id,
-            "summary": google_calendar.get("summary", ""),
-            "color": provider_color,
-            "provider_color": provider_color,
-            "access_role": google_calendar.get("accessRole", "reader"),
-            "selected": True,
-            "etag": google_calendar.get("etag")
+            if current is None:
+                row.update(color=provider_color, selected=True)
+                new_rows.append(row)
+                continue
+            row["id"] = current["id"]
+            if not current.get("color"):
+                row["color"] = provider_color
+            # Rows in one upsert share a column list, so existing colors and
+            # selections are left out of the update rather than rewritten.
+            rows_by_columns.setdefault(tuple(sorted(row)), []).append(row)
+
+        # Existing rows are updated through their primary key; new ones are inserted.
+        writes = [
+            self.supabase.table("connected_calendars").upsert(rows, on_conflict="id")
+            for rows in rows_by_columns.values()
+        ]
+        if new_rows:
+            writes.append(self.supabase.table("connected_calendars").insert(new_rows))
+        for write in writes:
+            for saved in write.execute().data or []:
+                existing[saved["provider_calendar_id"]] = saved
+
+        if changes["full"]:
+            removed |= set(existing) - listed
+        # Rows are hidden rather than deleted so color, selection and events survive a re-add.
+        hidden_ids = [
+            existing[google_calendar_id]["id"] for google_calendar_id in removed
+            if google_calendar_id in existing and not existing[google_calendar_id].get("hidden")
+        ]
+        if hidden_ids:
+            self.supabase.table("connected_calendars").update({"hidden": True}).in_("id", hidden_ids).execute()
+        for google_calendar_id in removed:
+            if google_calendar_id in existing:
+                existing[google_calendar_id]["hidden"] = True
+
+        next_sync_token = changes.get("next_sync_token")
+        if account_rows and next_sync_token and next_sync_token != sync_token:
+            token_query = (
+                self.supabase.table("calendar_accounts")
+                .update({"calendar_list_sync_token": next_sync_token})
+                .eq("user_id", self.user_id)
+                .eq("provider", "google")
+            )
+            if self.external_account_id:
+                token_query = token_query.eq("external_account_id", self.external_account_id)
+            try:
+                token_query.execute()
+            except Exception as e:
+                logger.warning("Failed to store calendar list sync token for %s: %s", self.user_id, e)
+
+        return {
+            "calendars": changes["items"],
+            "targets": [
+                (UUID(row["id"]), google_calendar_id)
+                for google_calendar_id, row in existing.items()
+                if not row.get("hidden")
+            ],
+            "primary_calendar_id": next(
+                (google_calendar_id for google_calendar_id, row in existing.items() if row.get("is_primary")),
+                None
+            )
         }
-        result = (
-            self.supabase.table("connected_calendars")
-            .insert(new_calendar)
-            .execute()
-        )
-        if not result.data:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Failed to insert connected calendar")
-        return UUID(result.data[0]["id"])
-    
+
     def _parse_event_boundaries(self, google_event: Dict[str, Any]) -> Dict[str, Any]:
         start_data = google_event.get("start", {}) or {}
         end_data = google_event.get("end", {}) or {}
@@ -143,6 +556,8 @@ class CalendarSyncService:
             "transparency": google_event.get("transparency", "opaque"),
             "visibility": google_event.get("visibility", "default"),
             "recurrence_rule": recurrence_rule,
+            "recurrence": recurrence or None,
+            "start_time_zone": (google_event.get("start") or {}).get("timeZone"),
             "recurring_event_id": recurring_event_id,
             "organizer_email": organizer_email,
             "attendees": google_event.get("attendees", []),
@@ -152,7 +567,12 @@ class CalendarSyncService:
             "last_modified_at": google_event.get("updated", datetime.now(timezone.utc).isoformat())
         }
     
-    def save_event(self, google_event: Dict[str, Any], calendar_id: UUID):
+    def save_event(self, google_event: Dict[str, Any], calendar_id: UUID, change_type: str = "updated"):
+        """Write one event straight through after an edit made via the API.
+
+        The whole row is upserted without reading the stored one, so its change
+        record has no field list; syncs go through save_events, which diffs.
+        """
         if google_event.get("status", "").lower() == "cancelled":
             return None
         db_event = self.normalize_event(google_event, calendar_id)
@@ -162,53 +582,350 @@ class CalendarSyncService:
             .execute()
         )
         saved_event = result.data[0] if result.data else None
+        if saved_event:
+            self.publish_changes([self._change_record(saved_event, change_type)])
         
         if saved_event and db_event.get('recurrence_rule'):
-            self._expand_recurring_event(saved_event, calendar_id)
+            self._expand_recurring_event(saved_event, calendar_id, google_event)
         
         return saved_event
     
-    def _expand_recurring_event(self, event: Dict[str, Any], calendar_id: UUID):
+    @staticmethod
+    def _collect_instance_override(google_event: Dict[str, Any], overrides_by_master: Dict[str, Dict[str, Any]]) -> None:
+        """Record modified or cancelled occurrences keyed by master id and original start."""
+        master_id = google_event.get("recurringEventId")
+        original = google_event.get("originalStartTime") or {}
+        original_start = parse_timestamp(original.get("dateTime") or original.get("date"))
+        if not master_id or not original_start:
+            return
+        override = {"status": google_event.get("status", "confirmed")}
+        start = google_event.get("start") or {}
+        end = google_event.get("end") or {}
+        instance_start = parse_timestamp(start.get("dateTime") or start.get("date"))
+        instance_end = parse_timestamp(end.get("dateTime") or end.get("date"))
+        if instance_start and instance_end:
+            override["instance_start_ts"] = instance_start.isoformat()
+            override["instance_end_ts"] = instance_end.isoformat()
+        overrides_by_master.setdefault(master_id, {})[timestamp_key(original_start)] = override
+    
+    def load_etag_map(self, calendar_id: UUID, external_ids=None) -> Dict[str, str]:
+        """Map external_id -> etag for live events, for the whole calendar or just `external_ids`."""
+        def _query():
+            return (
+                self.supabase.table("events")
+                .select("external_id,etag")
+                .eq("user_id", self.user_id)
+                .eq("calendar_id", str(calendar_id))
+                .is_("deleted_at", "null")
+            )
+
+        rows = []
+        if external_ids is None:
+            offset = 0
+            while True:
+                page = _query().order("external_id").range(offset, offset + ETAG_PAGE_SIZE - 1).execute().data or []
+                rows.extend(page)
+                if len(page) < ETAG_PAGE_SIZE:
+                    break
+                offset += ETAG_PAGE_SIZE
+        else:
+            external_ids = list(dict.fromkeys(external_ids))
+            for offset in range(0, len(external_ids), UPSERT_CHUNK_SIZE):
+                rows.extend(_query().in_("external_id", external_ids[offset:offset + UPSERT_CHUNK_SIZE]).execute().data or [])
+        return {row["external_id"]: row["etag"] for row in rows if row.get("external_id") and row.get("etag")}
+
+    def save_events(
+        self,
+        google_events,
+        calendar_id: UUID,
+        etag_map: Optional[Dict[str, str]] = None,
+        overrides_by_master: Optional[Dict[str, Dict[str, Any]]] = None,
+        deferred_expansions: Optional[list] = None
+    ) -> Dict[str, int]:
+        """Normalize and upsert changed events in chunks; returns written/skipped counts.
+
+        Events whose etag matches the stored row are skipped, unless one of their
+        instance overrides changed. `etag_map` may be preloaded by the caller;
+        otherwise it is loaded for this batch. Streaming callers pass a shared
+        `overrides_by_master` and `deferred_expansions` so recurring masters are
+        expanded once every page's overrides are known (see run_deferred_expansions).
+        """
+        rows_by_external_id = {}
+        google_by_external_id = {}
+        if overrides_by_master is None:
+            overrides_by_master = {}
+        for google_event in google_events:
+            self._collect_instance_override(google_event, overrides_by_master)
+            if (google_event.get("status") or "").lower() == "cancelled":
+                continue
+            try:
+                db_event = self.normalize_event(google_event, calendar_id)
+            except HTTPException:
+                continue
+            # A single upsert statement cannot touch the same conflict key twice.
+            rows_by_external_id[db_event["external_id"]] = db_event
+            google_by_external_id[db_event["external_id"]] = google_event
+
+        stored = None
+        if etag_map is None:
+            # One read serves both the etag skip and the column diff.
+            stored = self._load_stored_rows(calendar_id, rows_by_external_id.keys())
+            etag_map = {
+                external_id: row["etag"] for external_id, row in stored.items()
+                if row.get("etag") and not row.get("deleted_at")
+            }
+        changed_external_ids = {
+            external_id for external_id, row in rows_by_external_id.items()
+            if not row.get("etag") or etag_map.get(external_id) != row["etag"]
+        }
+        # A changed override needs its (possibly unchanged) master re-expanded.
+        for google_event in google_events:
+            master_id = google_event.get("recurringEventId")
+            if master_id in rows_by_external_id and etag_map.get(google_event.get("id")) != google_event.get("etag"):
+                changed_external_ids.add(master_id)
+
+        rows = [row for external_id, row in rows_by_external_id.items() if external_id in changed_external_ids]
+        saved_events, written = self._write_changed_rows(calendar_id, rows, stored)
+
+        for saved_event in saved_events:
+            external_id = saved_event.get("external_id")
+            if external_id:
+                etag_map[external_id] = saved_event.get("etag")
+            if not saved_event.get('recurrence_rule'):
+                continue
+            if deferred_expansions is not None:
+                deferred_expansions.append((saved_event, google_by_external_id.get(external_id)))
+                continue
+            self._expand_recurring_event(
+                saved_event,
+                calendar_id,
+                google_by_external_id.get(external_id),
+                overrides_by_master.get(external_id)
+            )
+
+        return {"written": written, "skipped": len(rows_by_external_id) - written}
+
+    def _load_stored_rows(self, calendar_id: UUID, external_ids) -> Dict[str, Dict[str, Any]]:
+        """Map external_id -> stored events row (including soft-deleted rows)."""
+        stored = {}
+        external_ids = list(dict.fromkeys(external_ids))
+        for offset in range(0, len(external_ids), UPSERT_CHUNK_SIZE):
+            result = (
+                self.supabase.table("events")
+                .select("*")
+                .eq("user_id", self.user_id)
+                .eq("calendar_id", str(calendar_id))
+                .in_("external_id", external_ids[offset:offset + UPSERT_CHUNK_SIZE])
+                .execute()
+            )
+            stored.update({row["external_id"]: row for row in result.data or []})
+        return stored
+
+    def _write_changed_rows(self, calendar_id: UUID, rows: list, stored: Optional[Dict[str, Dict[str, Any]]] = None) -> tuple:
+        """Diff normalized rows against stored ones and write only the columns that changed.
+
+        New rows are inserted whole; rows with no differences are not written.
+        `stored` may be passed by a caller that already read the rows. Returns
+        the resulting rows (the stored row for no-op writes) and how many rows
+        were written, and publishes created/updated change records.
+        """
+        if stored is None:
+            stored = self._load_stored_rows(calendar_id, [row["external_id"] for row in rows])
+
+        rows_by_columns: Dict[tuple, list] = {}
+        changed_fields: Dict[str, Optional[list]] = {}
+        unchanged = []
+        for row in rows:
+            current = stored.get(row["external_id"])
+            if current is None:
+                rows_by_columns.setdefault(tuple(sorted(row)), []).append(row)
+                changed_fields[row["external_id"]] = None
+                continue
+            changed = [
+                column for column, value in row.items()
+                if column not in EVENT_KEY_COLUMNS and column != "last_synced_at"
+                and not _same_column_value(column, current.get(column), value)
+            ]
+            if not changed:
+                unchanged.append(current)
+                continue
+            partial = {
+                column: row[column]
+                for column in (*EVENT_KEY_COLUMNS, *EVENT_REQUIRED_COLUMNS, *changed, "last_synced_at")
+            }
+            # Rows in one upsert share a column list, so group by the columns that changed.
+            rows_by_columns.setdefault(tuple(sorted(partial)), []).append(partial)
+            changed_fields[row["external_id"]] = [column for column in changed if column not in CHANGE_FEED_IGNORED_COLUMNS]
+
+        saved_events = []
+        for group in rows_by_columns.values():
+            for offset in range(0, len(group), UPSERT_CHUNK_SIZE):
+                result = (
+                    self.supabase.table("events")
+                    .upsert(group[offset:offset + UPSERT_CHUNK_SIZE], on_conflict="user_id,calendar_id,external_id")
+                    .execute()
+                )
+                saved_events.extend(result.data or [])
+
+        changes = []
+        for saved_event in saved_events:
+            fields = changed_fields.get(saved_event.get("external_id"), [])
+            if fields is None:
+                changes.append(self._change_record(saved_event, "created"))
+            elif fields:
+                changes.append(self._change_record(saved_event, "updated", fields))
+        self.publish_changes(changes)
+        return saved_events + unchanged, len(saved_events)
+
+    @staticmethod
+    def _change_record(event: Dict[str, Any], change_type: str, fields: Optional[list] = None) -> Dict[str, Any]:
+        return {
+            "user_id": event.get("user_id"),
+            "calendar_id": event.get("calendar_id"),
+            "event_id": event.get("id"),
+            "external_id": event.get("external_id"),
+            "change_type": change_type,
+            "changed_fields": fields
+        }
+
+    def publish_changes(self, changes: list) -> None:
+        """Append change records to the event_changes feed; a failed append never fails the sync.
+
+        The database assigns each record's id and changed_at, so the id order is
+        the order in which records became visible to readers.
+        """
+        for offset in range(0, len(changes), UPSERT_CHUNK_SIZE):
+            try:
+                self.supabase.table(CHANGE_FEED_TABLE).insert(changes[offset:offset + UPSERT_CHUNK_SIZE]).execute()
+            except Exception as e:
+                logger.warning("Failed to record %d event changes for %s: %s", len(changes), self.user_id, e)
+                return
+
+    def run_deferred_expansions(self, calendar_id: UUID, deferred_expansions: list, overrides_by_master: Dict[str, Dict[str, Any]]) -> None:
+        for saved_event, google_event in deferred_expansions:
+            self._expand_recurring_event(
+                saved_event,
+                calendar_id,
+                google_event,
+                overrides_by_master.get(saved_event.get("external_id"))
+            )
+    
+    def _expand_recurring_event(
+        self,
+        event: Dict[str, Any],
+        calendar_id: UUID,
+        google_event: Optional[Dict[str, Any]] = None,
+        overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+        window: Optional[tuple] = None,
+        prune_outside_window: bool = True
+    ):
+        """Materialize occurrences inside a window and diff them against stored instances.
+
+        `overrides` of None means the series' modified occurrences are unknown
+        (e.g. lazy expansion from stored rows), so existing exception rows are
+        left as they are instead of being reset to plain occurrences.
+        """
         recurrence_rule = event.get('recurrence_rule')
         if not recurrence_rule:
             return
         
         try:
-            rule = rrulestr(recurrence_rule, dtstart=datetime.fromisoformat(event['start_ts'].replace('Z', '+00:00')))
-            
-            now = datetime.now(timezone.utc)
-            expansion_start = now - timedelta(days=20 * 365)
-            expansion_end = now + timedelta(days=20 * 365)
+            recurrence = (google_event or {}).get("recurrence") or event.get("recurrence") or [recurrence_rule]
+            time_zone = ((google_event or {}).get("start") or {}).get("timeZone") or event.get("start_time_zone")
+            preserve_exceptions = overrides is None
+            start_ts = parse_timestamp(event['start_ts'])
+            end_ts = parse_timestamp(event['end_ts'])
+            window_start, window_end = window or default_expansion_window()
+            occurrences = expand_occurrences(recurrence, start_ts, end_ts, window_start, window_end, time_zone)
             
-            instances = []
-            for instance_start in rule.between(expansion_start, expansion_end):
-                original_start = datetime.fromisoformat(event['start_ts'].replace('Z', '+00:00'))
-                original_end = datetime.fromisoformat(event['end_ts'].replace('Z', '+00:00'))
-                duration = original_end - original_start
-                instance_end = instance_start + duration
-                
-                instances.append({
-                    "event_id": str(event['id']),
+            event_id = str(event['id'])
+            overrides = overrides or {}
+            desired = {}
+            for instance_start, instance_end in occurrences:
+                key = timestamp_key(instance_start)
+                row = {
+                    "event_id": event_id,
                     "instance_start_ts": instance_start.isoformat(),
                     "instance_end_ts": instance_end.isoformat(),
                     "original_start_ts": instance_start.isoformat(),
                     "status": event.get('status', 'confirmed'),
                     "is_exception": False
-                })
+                }
+                override = overrides.get(key)
+                if override:
+                    row.update(override)
+                    row["is_exception"] = True
+                desired[key] = row
             
-            if len(instances) > 200:
-                instances = instances[:200]
-            
-            self.supabase.table("event_instances").delete().eq("event_id", str(event['id'])).execute()
+            existing_result = (
+                self.supabase.table("event_instances")
+                .select("id,instance_start_ts,instance_end_ts,original_start_ts,status,is_exception")
+                .eq("event_id", event_id)
+                .execute()
+            )
+            stale_ids = []
+            changed = []
+            pruned_outside_window = False
+            for row in existing_result.data or []:
+                key = timestamp_key(row.get("original_start_ts"))
+                original_start = parse_timestamp(row.get("original_start_ts"))
+                in_window = original_start is not None and window_start <= original_start <= window_end
+                wanted = desired.pop(key, None)
+                if preserve_exceptions and row.get("is_exception"):
+                    continue
+                if wanted is None:
+                    if in_window or prune_outside_window:
+                        stale_ids.append(row["id"])
+                        pruned_outside_window = pruned_outside_window or not in_window
+                    continue
+                if (
+                    timestamp_key(row.get("instance_start_ts")) != timestamp_key(wanted["instance_start_ts"])
+                    or timestamp_key(row.get("instance_end_ts")) != timestamp_key(wanted["instance_end_ts"])
+                    or row.get("status") != wanted["status"]
+                    or bool(row.get("is_exception")) != wanted["is_exception"]
+                ):
+                    changed.append((row["id"], wanted))
             
-            if instances:
-                batch_size = 50
-                for i in range(0, len(instances), batch_size):
-                    batch = instances[i:i + batch_size]
-                    self.supabase.table("event_instances").insert(batch).execute()
+            for offset in range(0, len(stale_ids), UPSERT_CHUNK_SIZE):
+                self.supabase.table("event_instances").delete().in_("id", stale_ids[offset:offset + UPSERT_CHUNK_SIZE]).execute()
+            if pruned_outside_window:
+                # Lazily extended instances are gone; let the next navigation re-expand them.
+                recurrence_coverage.invalidate(self.user_id)
+            updates = [{"id": row_id, **wanted} for row_id, wanted in changed]
+            for offset in range(0, len(updates), UPSERT_CHUNK_SIZE):
+                self.supabase.table("event_instances").upsert(updates[offset:offset + UPSERT_CHUNK_SIZE], on_conflict="id").execute()
+            inserts = list(desired.values())
+            for offset in range(0, len(inserts), UPSERT_CHUNK_SIZE):
+                self.supabase.table("event_instances").insert(inserts[offset:offset + UPSERT_CHUNK_SIZE]).execute()
+            return True
                     
         except Exception as e:
-            pass
+            logger.warning("Recurrence expansion failed for event %s: %s", event.get('id'), e)
+            return False
+    
+    def expand_recurrences_for_range(self, window_start: datetime, window_end: datetime) -> int:
+        """Lazily extend stored instances when the user navigates past the default window."""
+        masters = (
+            self.supabase.table("events")
+            .select("id,calendar_id,start_ts,end_ts,status,recurrence_rule,recurrence,start_time_zone")
+            .eq("user_id", self.user_id)
+            .not_.is_("recurrence_rule", None)
+            .is_("deleted_at", None)
+            .lte("start_ts", window_end.isoformat())
+            .execute()
+        )
+        failed = 0
+        for master in masters.data or []:
+            if self._expand_recurring_event(
+                master,
+                master["calendar_id"],
+                window=(window_start, window_end),
+                prune_outside_window=False
+            ) is False:
+                failed += 1
+        if failed:
+            raise RuntimeError(f"Recurrence expansion failed for {failed} of {len(masters.data or [])} series")
+        return len(masters.data or [])
     
     def sync_state(self, calendar_id: UUID, **updates) -> Dict[str, Any]:
         defaults = {
@@ -244,238 +961,429 @@ class CalendarSyncService:
         )
         return res.data or payload
     
-    def sync_date_range(self, calendar_id: UUID, google_calendar_id: str, start_date: datetime, end_date: datetime) -> Optional[str]:
-        """Sync events month-by-month; returns the latest sync token."""
-        current = start_date
-        next_sync_token = None
-        
-        while current < end_date:
-            if current.month == 12:
-                month_end = datetime(current.year + 1, 1, 1, tzinfo=timezone.utc) - timedelta(seconds=1)
-            else:
-                month_end = datetime(current.year, current.month + 1, 1, tzinfo=timezone.utc) - timedelta(seconds=1)
-            month_end = min(month_end, end_date)
-            
+    def _iter_window_pages(self, google_calendar_id: str, window_start: datetime, window_end: datetime, page_token: Optional[str] = None):
+        """Yield (items, next_page_token, next_sync_token) for each page of one window."""
+        from googleapiclient.errors import HttpError
+
+        while True:
             try:
-                events_result = self.google_service._execute_with_retry(
+                page_result = self.google_service._execute_with_retry(
                     lambda svc: self.google_service._append_conference_data_version(
                         svc.events().list(
                             calendarId=google_calendar_id,
-                            timeMin=current.isoformat(),
-                            timeMax=month_end.isoformat(),
+                            timeMin=window_start.isoformat(),
+                            timeMax=window_end.isoformat(),
                             singleEvents=True,
-                            orderBy='startTime'
+                            orderBy='startTime',
+                            pageToken=page_token,
+                            fields=EVENT_LIST_FIELDS
                         )
                     ).execute(),
-                    f"fetch events for calendar {google_calendar_id} month {current.strftime('%Y-%m')}"
+                    f"fetch events for calendar {google_calendar_id} from {window_start.date()} to {window_end.date()}"
                 )
-                
-                events = events_result.get('items', [])
-                next_page_token = events_result.get('nextPageToken')
-                next_sync_token = events_result.get('nextSyncToken')
-                
-                while next_page_token:
-                    page_result = self.google_service._execute_with_retry(
-                        lambda svc: self.google_service._append_conference_data_version(
-                            svc.events().list(
-                                calendarId=google_calendar_id,
-                                timeMin=current.isoformat(),
-                                timeMax=month_end.isoformat(),
-                                singleEvents=True,
-                                orderBy='startTime',
-                                pageToken=next_page_token
-                            )
-                        ).execute(),
-                        f"fetch events page for calendar {google_calendar_id}"
+            except HttpError as e:
+                # A checkpointed page token can expire; restart the window from its first page.
+                if page_token and getattr(e.resp, "status", None) in (400, 410):
+                    page_token = None
+                    continue
+                raise
+            page_token = page_result.get('nextPageToken')
+            yield page_result.get('items', []), page_token, None if page_token else page_result.get('nextSyncToken')
+            if not page_token:
+                return
+
+    def sync_event_instances(
+        self,
+        calendar_id: UUID,
+        google_calendar_id: str,
+        event_id: str,
+        window_start: datetime,
+        window_end: datetime
+    ) -> Dict[str, Any]:
+        """Fetch one recurring series' occurrences via events.instances and upsert just those rows."""
+        totals = {"events_synced": 0, "events_written": 0, "events_skipped": 0}
+        page_token = None
+        while True:
+            page_result = self.google_service._execute_with_retry(
+                lambda svc: self.google_service._append_conference_data_version(
+                    svc.events().instances(
+                        calendarId=google_calendar_id,
+                        eventId=event_id,
+                        timeMin=window_start.isoformat(),
+                        timeMax=window_end.isoformat(),
+                        maxResults=250,
+                        pageToken=page_token,
+                        fields=EVENT_LIST_FIELDS
                     )
-                    events.extend(page_result.get('items', []))
-                    next_page_token = page_result.get('nextPageToken')
-                    if not next_page_token:
-                        next_sync_token = page_result.get('nextSyncToken')
-                
-                for event in events:
-                    self.save_event(event, calendar_id)
-                    
-            except Exception as e:
-                pass
-            
-            if current.month == 12:
-                current = datetime(current.year + 1, 1, 1, tzinfo=timezone.utc)
-            else:
-                current = datetime(current.year, current.month + 1, 1, tzinfo=timezone.utc)
-        
-        return next_sync_token
+                ).execute(),
+                f"fetch instances of {event_id} in calendar {google_calendar_id}"
+            )
+            items = page_result.get('items', [])
+            save_counts = self.save_events(items, calendar_id)
+            totals["events_synced"] += len(items)
+            totals["events_written"] += save_counts["written"]
+            totals["events_skipped"] += save_counts["skipped"]
+            page_token = page_result.get('nextPageToken')
+            if not page_token:
+                return totals
+
+    def _sync_window(
+        self,
+        calendar_id: UUID,
+        google_calendar_id: str,
+        window_start: datetime,
+        window_end: datetime,
+        checkpoint: RangeCheckpoint,
+        etag_map: Optional[Dict[str, str]] = None
+    ) -> tuple:
+        event_count = 0
+        counts = {"written": 0, "skipped": 0}
+        next_sync_token = None
+        transfer = {}
+        pages = prefetch_pages(
+            self._iter_window_pages(
+                google_calendar_id, window_start, window_end, checkpoint.resume_token(window_start, window_end)
+            ),
+            transfer
+        )
+        for items, next_page_token, next_sync_token in pages:
+            page_counts = self.save_events(items, calendar_id, etag_map)
+            event_count += len(items)
+            counts = {key: counts[key] + page_counts[key] for key in counts}
+            if next_page_token:
+                checkpoint.page_done(window_start, window_end, next_page_token)
+        counts["bytes_received"] = transfer.get("bytes_received", 0)
+        return event_count, counts, next_sync_token, time.monotonic()
+
+    def sync_date_range(
+        self,
+        calendar_id: UUID,
+        google_calendar_id: str,
+        start_date: datetime,
+        end_date: datetime,
+        resumable: bool = False,
+        keep_progress: bool = False
+    ) -> Dict[str, Any]:
+        """Sync density-sized windows concurrently; returns the sync token and a per-window report.
+
+        Windows are sized from the event density seen so far, so sparse calendars
+        take a few wide windows and dense ones many narrow windows.
+        With `resumable`, progress is checkpointed to event_sync_state so a rerun
+        skips completed spans and resumes in-flight windows from their page token.
+        `keep_progress` leaves the checkpoint in place for a later, wider range.
+        Windows nearest to now are fetched first.
+        """
+        checkpoint = RangeCheckpoint(self, calendar_id, resumable)
+        windows = checkpoint.plan(start_date, end_date)
+        report = [
+            {"start": window_start.isoformat(), "end": window_end.isoformat(), "status": "pending", "events": 0}
+            for window_start, window_end in windows
+        ]
+        now = datetime.now(timezone.utc)
+        pending = sorted(
+            range(len(windows)),
+            key=lambda index: max(windows[index][0] - now, now - windows[index][1], timedelta(0))
+        )
+
+        issued_tokens = []
+        if pending:
+            # One bulk read replaces a per-window lookup; windows only touch their own keys.
+            etag_map = self.load_etag_map(calendar_id)
+            workers = max(1, min(settings.SYNC_WINDOW_CONCURRENCY, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync-window") as pool:
+                futures = {
+                    pool.submit(self._sync_window, calendar_id, google_calendar_id, *windows[index], checkpoint, etag_map): index
+                    for index in pending
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    entry = report[index]
+                    try:
+                        event_count, counts, next_sync_token, finished_at = future.result()
+                    except Exception as e:
+                        entry["status"] = "error"
+                        entry["error"] = getattr(e, "detail", None) or str(e)
+                        continue
+                    entry["status"] = "completed"
+                    entry["events"] = event_count
+                    entry.update(counts)
+                    if next_sync_token:
+                        issued_tokens.append((finished_at, next_sync_token))
+                    checkpoint.window_done(*windows[index], next_sync_token, event_count)
+
+        # Keep the token issued first: delta sync then replays anything that changed
+        # while the remaining windows were still being read.
+        next_sync_token = checkpoint.sync_token or (min(issued_tokens)[1] if issued_tokens else None)
+        failed = [entry for entry in report if entry["status"] == "error"]
+        if failed:
+            logger.warning(
+                "Range sync for calendar %s: %d of %d windows failed",
+                google_calendar_id, len(failed), len(report)
+            )
+        elif resumable and not keep_progress:
+            checkpoint.finish()
+        return {
+            "next_sync_token": next_sync_token,
+            "events_synced": sum(entry["events"] for entry in report),
+            "events_written": sum(entry.get("written", 0) for entry in report),
+            "events_skipped": sum(entry.get("skipped", 0) for entry in report),
+            "bytes_received": sum(entry.get("bytes_received", 0) for entry in report),
+            "windows_failed": len(failed),
+            "window_days": round(checkpoint.window_days(), 1),
+            "backfill_before_ts": checkpoint.before_ts.isoformat() if checkpoint.before_ts else None,
+            "backfill_after_ts": checkpoint.after_ts.isoformat() if checkpoint.after_ts else None,
+            "windows": report,
+        }
     
-    def delta_sync(self, calendar_id: UUID, google_calendar_id: str) -> Dict[str, Any]:
-        """Perform incremental sync using syncToken (falls back on 410 Gone)."""
-        from googleapiclient.errors import HttpError
-        
-        sync_state = self.sync_state(calendar_id)
-        sync_token = sync_state.get('next_sync_token')
-        
-        def _do_sync(token: Optional[str] = None) -> Dict[str, Any]:
-            events = []
-            next_sync_token = None
-            next_page_token = None
-            
-            if token:
+    def apply_cancellations(self, external_ids, calendar_id: Optional[UUID] = None) -> Dict[str, int]:
+        """Soft-delete cancelled events (and their occurrences) with set-based queries.
+
+        Pass `calendar_id` to scope the cancellation to one calendar; the same
+        Google event id appears on every attendee's calendar.
+        """
+        external_ids = list(dict.fromkeys(external_ids))
+        cancelled_rows = 0
+        instances_removed = 0
+        payload = {
+            "deleted_at": datetime.now(timezone.utc).isoformat(),
+            "status": "cancelled"
+        }
+        for offset in range(0, len(external_ids), UPSERT_CHUNK_SIZE):
+            chunk = external_ids[offset:offset + UPSERT_CHUNK_SIZE]
+            internal_ids = set()
+            changes = []
+            for column in ("external_id", "recurring_event_id"):
+                query = (
+                    self.supabase.table("events")
+                    .update(payload)
+                    .eq("user_id", self.user_id)
+                    .in_(column, chunk)
+                    .is_("deleted_at", "null")
+                )
+                if calendar_id is not None:
+                    query = query.eq("calendar_id", str(calendar_id))
+                result = query.execute()
+                for row in result.data or []:
+                    if row.get("id") and row["id"] not in internal_ids:
+                        internal_ids.add(row["id"])
+                        changes.append(self._change_record(row, "cancelled"))
+            self.publish_changes(changes)
+            cancelled_rows += len(internal_ids)
+            if internal_ids:
                 try:
-                    events_result = self.google_service._execute_with_retry(
-                        lambda svc: svc.events().list(
-                            calendarId=google_calendar_id,
-                            syncToken=token,
-                            maxResults=500,
-                            showDeleted=True
-                        ).execute(),
-                        f"delta sync for {google_calendar_id}"
+                    deleted = (
+                        self.supabase.table("event_instances")
+                        .delete()
+                        .in_("event_id", list(internal_ids))
+                        .execute()
                     )
-                except HttpError as e:
-                    if e.resp.status == 410:
-                        self.sync_state(calendar_id, next_sync_token=None)
-                        return _do_sync(None)
-                    raise
-            else:
-                now = datetime.now(timezone.utc)
-                time_min = (now - timedelta(days=365)).isoformat()
-                time_max = (now + timedelta(days=365)).isoformat()
-                events_result = self.google_service._execute_with_retry(
-                    lambda svc: svc.events().list(
-                        calendarId=google_calendar_id,
-                        timeMin=time_min,
-                        timeMax=time_max,
-                        maxResults=500,
-                        singleEvents=True,
-                        showDeleted=True
-                    ).execute(),
-                    f"full sync for {google_calendar_id}"
+                    instances_removed += len(deleted.data or [])
+                except Exception as e:
+                    pass
+        return {
+            "events_cancelled": len(external_ids),
+            "rows_cancelled": cancelled_rows,
+            "instances_removed": instances_removed
+        }
+    
+    def _iter_delta_pages(self, calendar_id: UUID, google_calendar_id: str, sync_token: Optional[str]):
+        """Yield (items, next_page_token, next_sync_token) for an incremental (or fallback full) listing."""
+        from googleapiclient.errors import HttpError
+
+        params = {
+            "calendarId": google_calendar_id,
+            "maxResults": 500,
+            "showDeleted": True,
+            "fields": EVENT_LIST_FIELDS,
+        }
+        if sync_token:
+            params["syncToken"] = sync_token
+            description = f"delta sync for {google_calendar_id}"
+        else:
+            now = datetime.now(timezone.utc)
+            params.update(
+                timeMin=(now - timedelta(days=365)).isoformat(),
+                timeMax=(now + timedelta(days=365)).isoformat(),
+                singleEvents=True
+            )
+            description = f"full sync for {google_calendar_id}"
+
+        page_token = None
+        while True:
+            request_params = {**params, "pageToken": page_token} if page_token else params
+            try:
+                result = self.google_service._execute_with_retry(
+                    lambda svc: svc.events().list(**request_params).execute(),
+                    description
                 )
-            
-            events.extend(events_result.get('items', []))
-            next_page_token = events_result.get('nextPageToken')
-            next_sync_token = events_result.get('nextSyncToken')
-            
-            while next_page_token:
-                if token:
-                    page_result = self.google_service._execute_with_retry(
-                        lambda svc: svc.events().list(
-                            calendarId=google_calendar_id,
-                            syncToken=token,
-                            pageToken=next_page_token,
-                            maxResults=500,
-                            showDeleted=True
-                        ).execute(),
-                        f"delta sync page for {google_calendar_id}"
-                    )
-                else:
-                    now = datetime.now(timezone.utc)
-                    time_min = (now - timedelta(days=365)).isoformat()
-                    time_max = (now + timedelta(days=365)).isoformat()
-                    page_result = self.google_service._execute_with_retry(
-                        lambda svc: svc.events().list(
-                            calendarId=google_calendar_id,
-                            timeMin=time_min,
-                            timeMax=time_max,
-                            pageToken=next_page_token,
-                            maxResults=500,
-                            singleEvents=True,
-                            showDeleted=True
-                        ).execute(),
-                        f"full sync page for {google_calendar_id}"
-                    )
-                events.extend(page_result.get('items', []))
-                next_page_token = page_result.get('nextPageToken')
-                if not next_page_token:
-                    next_sync_token = page_result.get('nextSyncToken')
-            
-            return {"events": events, "next_sync_token": next_sync_token}
+            except HttpError as e:
+                if sync_token and page_token is None and e.resp.status == 410:
+                    self.sync_state(calendar_id, next_sync_token=None)
+                    yield from self._iter_delta_pages(calendar_id, google_calendar_id, None)
+                    return
+                raise
+            page_token = result.get('nextPageToken')
+            yield result.get('items', []), page_token, None if page_token else result.get('nextSyncToken')
+            if not page_token:
+                return
+
+    def delta_sync(self, calendar_id: UUID, google_calendar_id: str, fanout: Optional[list] = None) -> Dict[str, Any]:
+        """Perform incremental sync using syncToken (falls back on 410 Gone).
+
+        Pages are written as they arrive; the new sync token is stored only after
+        the last page has been persisted. `fanout` is a list of (CalendarSyncService,
+        calendar_id) subscribers of the same Google calendar that receive each page
+        too (see db.shared_calendars); a subscriber that fails is dropped.
+        """
+        sync_state = self.sync_state(calendar_id)
+        sync_token = sync_state.get('next_sync_token')
+        totals = {"events_synced": 0, "events_written": 0, "events_skipped": 0}
+        cancellation_counts: Dict[str, int] = {}
+        overrides_by_master: Dict[str, Dict[str, Any]] = {}
+        deferred_expansions: list = []
+        transfer = {}
+        subscribers = [
+            {"service": service, "calendar_id": subscriber_calendar_id, "overrides": {}, "deferred": []}
+            for service, subscriber_calendar_id in fanout or []
+        ]
         
         try:
-            result = _do_sync(sync_token)
-            events = result.get("events", [])
-            new_sync_token = result.get("next_sync_token")
-            
+            new_sync_token = None
+            pages = prefetch_pages(self._iter_delta_pages(calendar_id, google_calendar_id, sync_token), transfer)
+            for events, _, next_sync_token in pages:
+                cancelled_ids = [event.get('id') for event in events if event.get('status') == 'cancelled' and event.get('id')]
+                if cancelled_ids:
+                    for key, value in self.apply_cancellations(cancelled_ids, calendar_id).items():
+                        cancellation_counts[key] = cancellation_counts.get(key, 0) + value
+                
+                save_counts = self.save_events(
+                    events,
+                    calendar_id,
+                    overrides_by_master=overrides_by_master,
+                    deferred_expansions=deferred_expansions
+                )
+                totals["events_synced"] += len(events)
+                totals["events_written"] += save_counts["written"]
+                totals["events_skipped"] += save_counts["skipped"]
+                new_sync_token = next_sync_token or new_sync_token
+                subscribers = self._fan_out_page(subscribers, events, cancelled_ids)
             
-            for event in events:
-                if event.get('status') == 'cancelled':
-                    external_id = event.get('id')
-                    self.supabase.table("events").update({
-                        "deleted_at": datetime.now(timezone.utc).isoformat(),
-                        "status": "cancelled"
-                    }).eq("user_id", self.user_id).eq("external_id", external_id).execute()
-                    self.supabase.table("events").update({
-                        "deleted_at": datetime.now(timezone.utc).isoformat(),
-                        "status": "cancelled"
-                    }).eq("user_id", self.user_id).eq("recurring_event_id", external_id).execute()
-                    try:
-                        internal_ids = []
-                        internal_master = (
-                            self.supabase.table("events")
-                            .select("id")
-                            .eq("user_id", self.user_id)
-                            .eq("external_id", external_id)
-                            .maybe_single()
-                            .execute()
-                        )
-                        internal_master_data = getattr(internal_master, "data", None) if internal_master is not None else None
-                        if internal_master_data:
-                            internal_ids.append(internal_master_data.get("id"))
-                        linked_rows = (
-                            self.supabase.table("events")
-                            .select("id")
-                            .eq("user_id", self.user_id)
-                            .eq("recurring_event_id", external_id)
-                            .execute()
-                        )
-                        linked_rows_data = getattr(linked_rows, "data", None) if linked_rows is not None else None
-                        for row in linked_rows_data or []:
-                            if row.get("id"):
-                                internal_ids.append(row["id"])
-                        for iid in internal_ids:
-                            self.supabase.table("event_instances").delete().eq("event_id", iid).execute()
-                    except Exception as e:
-                        pass
-                else:
-                    self.save_event(event, calendar_id)
+            self.run_deferred_expansions(calendar_id, deferred_expansions, overrides_by_master)
             
-            update_payload = {"last_delta_sync_at": datetime.now(timezone.utc).isoformat()}
+            synced_at = datetime.now(timezone.utc).isoformat()
+            update_payload = {"last_delta_sync_at": synced_at}
             if new_sync_token:
                 update_payload["next_sync_token"] = new_sync_token
             self.sync_state(calendar_id, **update_payload)
             
-            return {"status": "completed", "events_synced": len(events)}
+            shared_with = 0
+            for subscriber in subscribers:
+                service = subscriber["service"]
+                try:
+                    service.run_deferred_expansions(subscriber["calendar_id"], subscriber["deferred"], subscriber["overrides"])
+                    try:
+                        service.sync_state(subscriber["calendar_id"], last_delta_sync_at=synced_at, shared_synced_at=synced_at)
+                    except Exception as e:
+                        # Without shared_synced_at (migration 009) peers resync, but the delta sync time still counts.
+                        logger.warning("Failed to mark calendar %s shared-synced: %s", subscriber["calendar_id"], e)
+                        service.sync_state(subscriber["calendar_id"], last_delta_sync_at=synced_at)
+                    shared_with += 1
+                except Exception as e:
+                    logger.warning("Shared sync to calendar %s failed: %s", subscriber["calendar_id"], e)
+            
+            result = {
+                "status": "completed",
+                **totals,
+                "bytes_received": transfer.get("bytes_received", 0),
+                **cancellation_counts
+            }
+            if fanout:
+                result["shared_with"] = shared_with
+            return result
             
         except Exception as e:
-            return {"status": "error", "events_synced": 0, "error": str(e)}
+            return {"status": "error", "events_synced": totals["events_synced"], "error": str(e)}
     
+    @staticmethod
+    def _fan_out_page(subscribers: list, events: list, cancelled_ids: list) -> list:
+        """Write one fetched page into each subscriber's rows; returns the subscribers still healthy."""
+        healthy = []
+        for subscriber in subscribers:
+            service = subscriber["service"]
+            try:
+                if cancelled_ids:
+                    service.apply_cancellations(cancelled_ids, subscriber["calendar_id"])
+                service.save_events(
+                    events,
+                    subscriber["calendar_id"],
+                    overrides_by_master=subscriber["overrides"],
+                    deferred_expansions=subscriber["deferred"]
+                )
+                healthy.append(subscriber)
+            except Exception as e:
+                logger.warning("Shared sync to calendar %s failed: %s", subscriber["calendar_id"], e)
+        return healthy
+
+    @staticmethod
+    def _default_backfill_range(now: Optional[datetime] = None) -> tuple:
+        """Two years either side of now, aligned to month starts so reruns hit the same windows."""
+        now = now or datetime.now(timezone.utc)
+        return (
+            datetime(now.year - 2, now.month, 1, tzinfo=timezone.utc),
+            datetime(now.year + 2, now.month, 1, tzinfo=timezone.utc),
+        )
+
+    @staticmethod
+    def _backfill_stages(backfill_start: datetime, backfill_end: datetime) -> list:
+        """Near-now-first ranges: this month, the surrounding months, then the full range."""
+        now = datetime.now(timezone.utc)
+        stages = []
+        for radius in BACKFILL_STAGE_RADII_MONTHS:
+            stage_start = max(backfill_start, _shift_months(now, -radius))
+            stage_end = min(backfill_end, _shift_months(now, radius + 1))
+            if stage_start < stage_end and (stage_start, stage_end) not in stages:
+                stages.append((stage_start, stage_end))
+        if (backfill_start, backfill_end) not in stages:
+            stages.append((backfill_start, backfill_end))
+        return stages
+
     def backfill_calendar(self, backfill_before_ts: Optional[str] = None, backfill_after_ts: Optional[str] = None):
-        calendars = self.google_service.list_calendars()
+        targets = self.sync_calendar_list()["targets"]
         
-        if not calendars:
+        if not targets:
             raise HTTPException(status_code=404, detail="No calendars found")
         
-        for calendar in calendars:
-            google_calendar_id = calendar.get("id")
-            calendar_id = self.get_calendar_id(calendar)
-            
-            now = datetime.now(timezone.utc)
-            backfill_start = now - timedelta(days=2 * 365)
-            backfill_end = now + timedelta(days=2 * 365)
-            try:
-                if isinstance(backfill_before_ts, str) and backfill_before_ts:
-                    backfill_start = datetime.fromisoformat(backfill_before_ts.replace('Z', '+00:00'))
-                if isinstance(backfill_after_ts, str) and backfill_after_ts:
-                    backfill_end = datetime.fromisoformat(backfill_after_ts.replace('Z', '+00:00'))
-            except Exception:
-                backfill_start = now - timedelta(days=2 * 365)
-                backfill_end = now + timedelta(days=2 * 365)
-            
-            next_sync_token = self.sync_date_range(calendar_id, google_calendar_id, backfill_start, backfill_end)
-            
-            self.sync_state(
-                calendar_id,
-                next_sync_token=next_sync_token,
-                backfill_before_ts=backfill_start.isoformat(),
-                backfill_after_ts=backfill_end.isoformat(),
-                last_full_sync_at=datetime.now(timezone.utc).isoformat()
-            )
+        backfill_start, backfill_end = self._default_backfill_range()
+        try:
+            if isinstance(backfill_before_ts, str) and backfill_before_ts:
+                backfill_start = datetime.fromisoformat(backfill_before_ts.replace('Z', '+00:00'))
+            if isinstance(backfill_after_ts, str) and backfill_after_ts:
+                backfill_end = datetime.fromisoformat(backfill_after_ts.replace('Z', '+00:00'))
+        except Exception:
+            backfill_start, backfill_end = self._default_backfill_range()
+
+        stages = self._backfill_stages(backfill_start, backfill_end)
+
+        # Every calendar finishes a stage before any starts the next, so the
+        # current month is visible across all calendars first.
+        for stage_index, (stage_start, stage_end) in enumerate(stages):
+            final_stage = stage_index == len(stages) - 1
+            for calendar_id, google_calendar_id in targets:
+                # Coverage (backfill_before_ts/after_ts) is checkpointed as windows complete.
+                range_report = self.sync_date_range(
+                    calendar_id,
+                    google_calendar_id,
+                    stage_start,
+                    stage_end,
+                    resumable=True,
+                    keep_progress=not final_stage
+                )
+
+                updates = {}
+                if range_report["next_sync_token"]:
+                    updates["next_sync_token"] = range_report["next_sync_token"]
+                if final_stage and not range_report["windows_failed"]:
+                    updates["last_full_sync_at"] = datetime.now(timezone.utc).isoformat()
+                if updates:
+                    self.sync_state(calendar_id, **updates)
         
@@ -1,16 +1,45 @@
+import json
+import logging
 import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from supabase import Client
 from fastapi import HTTPException, status
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 from google.auth.transport.requests import Request as GoogleRequest
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from config import settings
+from db.google_rate_limit import (
+    backoff_delay,
+    get_rate_limiter,
+    google_api_metrics,
+    is_rate_limit_error,
+    retry_after_seconds,
+)
+
+logger = logging.getLogger(__name__)
 
 socket.setdefaulttimeout(30)
 
+GOOGLE_BATCH_SIZE = 50
+
+# Partial-response masks: only what normalize_event and the client read.
+# gzip needs no setup; the client library already sends Accept-Encoding and a "(gzip)" user agent.
+EVENT_FIELDS = (
+    "id,etag,status,summary,description,location,hangoutLink,conferenceData,start,end,"
+    "transparency,visibility,recurrence,recurringEventId,originalStartTime,iCalUID,updated,"
+    "extendedProperties,organizer(email,displayName,self),"
+    "attendees(email,displayName,responseStatus,optional,organizer,self)"
+)
+EVENT_LIST_FIELDS = f"nextPageToken,nextSyncToken,items({EVENT_FIELDS})"
+
 SCOPES = [
     "https://www.googleapis.com/auth/calendar",
     "https://www.googleapis.com/auth/calendar.events",
@@ -19,6 +48,151 @@ SCOPES = [
 ]
 
 
+_discovery_lock = threading.Lock()
+_calendar_discovery_json = None
+_thread_transports = threading.local()
+
+
+def _get_calendar_discovery_document() -> dict:
+    """This thread's parsed Calendar v3 discovery document.
+
+    googleapiclient fills in method parameters on the document during build and
+    on resource access, so threads must not share one dict. The bundled JSON is
+    read once per process and parsed once per thread, matching the per-thread
+    service objects built from it.
+    """
+    global _calendar_discovery_json
+    document = getattr(_thread_transports, "discovery", None)
+    if document is None:
+        if _calendar_discovery_json is None:
+            with _discovery_lock:
+                if _calendar_discovery_json is None:
+                    _calendar_discovery_json = get_static_doc("calendar", "v3")
+        document = _thread_transports.discovery = json.loads(_calendar_discovery_json)
+    return document
+
+
+def _get_thread_http() -> httplib2.Http:
+    # httplib2.Http is not thread-safe, so each worker thread keeps its own transport.
+    http = getattr(_thread_transports, "http", None)
+    if http is None:
+        http = httplib2.Http(timeout=30)
+        _thread_transports.http = http
+    return http
+
+
+def thread_bytes_received() -> int:
+    """Decoded Google response bytes received so far on the calling thread."""
+    return getattr(_thread_transports, "bytes_received", 0)
+
+
+def _metered(http):
+    # httplib2 inflates gzip bodies before we see them, so this counts decoded bytes.
+    send = http.request
+
+    def request(*args, **kwargs):
+        response, content = send(*args, **kwargs)
+        size = len(content or b"")
+        _thread_transports.bytes_received = thread_bytes_received() + size
+        google_api_metrics.record(
+            bytes_received=size,
+            gzip_responses=1 if response.get("-content-encoding") in ("gzip", "deflate") else 0
+        )
+        return response, content
+
+    http.request = request
+    return http
+
+
+def build_calendar_service(credentials: Credentials):
+    """Bind credentials to the cached Calendar discovery document on this thread's transport."""
+    return build_from_document(
+        _get_calendar_discovery_document(),
+        http=_metered(AuthorizedHttp(credentials, http=_get_thread_http()))
+    )
+
+
+class _AccountCredentials(Credentials):
+    """Credentials shared by every service object for one Google account.
+
+    Expiry checks, AuthorizedHttp and batch requests (on a 401) all call
+    refresh(), so it is single-flight and writes the new token back to
+    calendar_accounts.
+    """
+
+    def __init__(self, *args, supabase: Client, user_id: str, account_id: Optional[str], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.supabase = supabase
+        self.user_id = user_id
+        self.account_id = account_id
+        self.refresh_lock = threading.RLock()
+
+    def refresh(self, request):
+        stale_token = self.token
+        with self.refresh_lock:
+            # Another thread replaced the token while this one waited for the lock.
+            if self.token != stale_token:
+                return
+            super().refresh(request)
+            self.expiry = _as_naive_utc(self.expiry)
+            update_query = (
+                self.supabase.table("calendar_accounts")
+                .update({
+                    "access_token": self.token,
+                    "expires_at": _isoformat_utc(self.expiry)
+                })
+                .eq("user_id", self.user_id)
+                .eq("provider", "google")
+            )
+            if self.account_id:
+                update_query = update_query.eq("external_account_id", self.account_id)
+            update_query.execute()
+
+
+class _CredentialEntry:
+    def __init__(self, credentials: _AccountCredentials, account_id: Optional[str]):
+        self.credentials = credentials
+        self.account_id = account_id
+        self.loaded_at = time.monotonic()
+
+
+_credential_cache_lock = threading.Lock()
+_credential_cache: dict[tuple[str, Optional[str]], _CredentialEntry] = {}
+_credential_load_locks: dict[tuple[str, Optional[str]], threading.Lock] = {}
+
+
+def _get_cached_credentials(key: tuple[str, Optional[str]]) -> Optional[_CredentialEntry]:
+    with _credential_cache_lock:
+        entry = _credential_cache.get(key)
+        if entry and time.monotonic() - entry.loaded_at > settings.GOOGLE_CREDENTIAL_CACHE_TTL_SECONDS:
+            _credential_cache.pop(key, None)
+            return None
+        return entry
+
+
+def _get_load_lock(key: tuple[str, Optional[str]]) -> threading.Lock:
+    with _credential_cache_lock:
+        return _credential_load_locks.setdefault(key, threading.Lock())
+
+
+def invalidate_google_credentials(user_id: str, external_account_id: Optional[str] = None) -> None:
+    """Drop cached credentials after tokens are written outside GoogleCalendarService."""
+    with _credential_cache_lock:
+        for key, entry in list(_credential_cache.items()):
+            if key[0] != user_id:
+                continue
+            if external_account_id is None or external_account_id in (key[1], entry.account_id):
+                _credential_cache.pop(key, None)
+
+
+def _needs_refresh(creds: Credentials) -> bool:
+    now = datetime.utcnow()
+    creds.expiry = _as_naive_utc(creds.expiry)
+    if creds.expiry:
+        return creds.expired or creds.expiry <= (now + timedelta(minutes=5))
+    return creds.expired or not creds.valid
+
+
 def _parse_iso_datetime(value: str):
     if not value:
         return None
@@ -82,9 +256,19 @@ class GoogleCalendarService:
         self.supabase = supabase
         self.external_account_id = external_account_id
         self.credentials = None
-        self.service = None
+        self._thread_state = threading.local()
+        self._credential_entry = None
         self._resolved_account_id = None
     
+    @property
+    def service(self):
+        # Service objects hold a thread-bound transport, so each thread keeps its own.
+        return getattr(self._thread_state, "service", None)
+
+    @service.setter
+    def service(self, value):
+        self._thread_state.service = value
+    
     def _append_conference_data_version(self, request):
         if not request:
             return request
@@ -98,122 +282,144 @@ class GoogleCalendarService:
             pass
         return request
     
-    def _execute_with_retry(self, action, description: str, retries: int = 3):
-        last_error = None
-        for attempt in range(1, retries + 1):
+    def _execute_with_retry(self, action, description: str, retries: int = 3, cost: int = 1):
+        """Run `action(service)` under the account's rate limiter.
+
+        Rate-limit responses (429, 403 rateLimitExceeded) back off with jitter and
+        honour Retry-After on their own retry budget; timeouts back off up to `retries`.
+        """
+        attempt = 0
+        throttled_attempts = 0
+        while attempt < retries:
+            attempt += 1
+            limiter = None
             try:
                 service = self.get_service()
-                return action(service)
-            except HttpError:
-                raise
+                limiter = get_rate_limiter(self.user_id, self._resolved_account_id or self.external_account_id)
+                waited = limiter.acquire(cost)
+                google_api_metrics.record(requests=1, limiter_wait_seconds=waited)
+                result = action(service)
+                limiter.on_success()
+                return result
+            except HttpError as exc:
+                if limiter is None or not is_rate_limit_error(exc) or throttled_attempts >= settings.GOOGLE_RATE_LIMIT_RETRIES:
+                    raise
+                throttled_attempts += 1
+                attempt -= 1
+                delay = backoff_delay(throttled_attempts, retry_after_seconds(exc))
+                limiter.on_throttled(delay)
+                google_api_metrics.record(throttled_responses=1, retries=1, backoff_seconds=delay)
+                logger.info("Google rate limit on %s; retrying in %.2fs", description, delay)
+                time.sleep(delay)
             except (socket.timeout, TimeoutError, OSError) as exc:
-                last_error = exc
                 self.service = None
                 if attempt < retries:
-                    import time
-                    time.sleep(1)
+                    delay = backoff_delay(attempt)
+                    google_api_metrics.record(retries=1, backoff_seconds=delay)
+                    time.sleep(delay)
             except Exception as exc:
-                last_error = exc
                 self.service = None
         raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail="Google Calendar temporarily unavailable. Please try again.")
     
     def get_credentials(self) -> Credentials:
         if self.credentials is None:
-            try:
-                query = (
-                    self.supabase.table("calendar_accounts")
-                    .select("*")
-                    .eq("user_id", self.user_id)
-                    .eq("provider", "google")
-                )
-                
-                if self.external_account_id:
-                    query = query.eq("external_account_id", self.external_account_id)
-                
-                result = query.execute()
-            except Exception as e:
-                error_msg = str(e)
-                if "JWT expired" in error_msg or "PGRST303" in error_msg:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Session expired. Please refresh.",
-                        headers={"X-Token-Expired": "true"}
-                    )
-                raise
+            cache_key = (self.user_id, self.external_account_id)
+            entry = _get_cached_credentials(cache_key)
+            if entry is None:
+                with _get_load_lock(cache_key):
+                    entry = _get_cached_credentials(cache_key) or self._load_credentials(cache_key)
+            self._credential_entry = entry
+            self._resolved_account_id = entry.account_id
+            self.credentials = entry.credentials
+        return self.credentials
+
+    def _load_credentials(self, cache_key: tuple[str, Optional[str]]) -> _CredentialEntry:
+        try:
+            query = (
+                self.supabase.table("calendar_accounts")
+                .select("*")
+                .eq("user_id", self.user_id)
+                .eq("provider", "google")
+            )
+            
+            if self.external_account_id:
+                query = query.eq("external_account_id", self.external_account_id)
             
-            if not result.data:
+            result = query.execute()
+        except Exception as e:
+            error_msg = str(e)
+            if "JWT expired" in error_msg or "PGRST303" in error_msg:
                 raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="Google credentials not found"
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Session expired. Please refresh.",
+                    headers={"X-Token-Expired": "true"}
                 )
-            
-            record = result.data[0]
-            self._resolved_account_id = record.get("external_account_id")
-            expiry_value = record.get("expires_at")
-            parsed_expiry = _parse_iso_datetime(expiry_value)
-
-            scopes = record.get("scopes", [])
-            if isinstance(scopes, str):
-                scopes = [scope.strip() for scope in scopes.split(',') if scope.strip()]
-            if not scopes:
-                scopes = SCOPES
-
-            self.credentials = Credentials(
-                token=record["access_token"],
-                refresh_token=record["refresh_token"],
-                token_uri="https://oauth2.googleapis.com/token",
-                client_id=settings.GOOGLE_CLIENT_ID,
-                client_secret=settings.GOOGLE_CLIENT_SECRET,
-                scopes=scopes
+            raise
+        
+        if not result.data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Google credentials not found"
             )
-            if parsed_expiry:
-                self.credentials.expiry = _as_naive_utc(parsed_expiry)
-            else:
-                self.credentials.expiry = _as_naive_utc(self.credentials.expiry)
-        return self.credentials
+        
+        record = result.data[0]
+        account_id = record.get("external_account_id")
+        expiry_value = record.get("expires_at")
+        parsed_expiry = _parse_iso_datetime(expiry_value)
+
+        scopes = record.get("scopes", [])
+        if isinstance(scopes, str):
+            scopes = [scope.strip() for scope in scopes.split(',') if scope.strip()]
+        if not scopes:
+            scopes = SCOPES
+
+        credentials = _AccountCredentials(
+            supabase=self.supabase,
+            user_id=self.user_id,
+            account_id=self.external_account_id or account_id,
+            token=record["access_token"],
+            refresh_token=record["refresh_token"],
+            token_uri="https://oauth2.googleapis.com/token",
+            client_id=settings.GOOGLE_CLIENT_ID,
+            client_secret=settings.GOOGLE_CLIENT_SECRET,
+            scopes=scopes
+        )
+        if parsed_expiry:
+            credentials.expiry = _as_naive_utc(parsed_expiry)
+        else:
+            credentials.expiry = _as_naive_utc(credentials.expiry)
+
+        with _credential_cache_lock:
+            # Requests with and without an explicit account id must share one entry,
+            # otherwise each would refresh the same token independently.
+            entry = _credential_cache.get((self.user_id, account_id))
+            if entry is None:
+                entry = _CredentialEntry(credentials, account_id)
+                _credential_cache[(self.user_id, account_id)] = entry
+            _credential_cache[cache_key] = entry
+        return entry
     
     def refresh_token_if_needed(self) -> None:
         creds = self.get_credentials()
+        if not _needs_refresh(creds):
+            return
 
-        now = datetime.utcnow()
-        creds.expiry = _as_naive_utc(creds.expiry)
-        needs_refresh = creds.expired
-        expiry_value = creds.expiry
-        if expiry_value:
-            needs_refresh = needs_refresh or (expiry_value <= (now + timedelta(minutes=5)))
-        elif not creds.valid:
-            needs_refresh = True
-
-        if needs_refresh:
+        with creds.refresh_lock:
+            if not _needs_refresh(creds):
+                return
             try:
                 creds.refresh(GoogleRequest())
             except Exception as error:
+                invalidate_google_credentials(self.user_id, self._resolved_account_id)
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Google session expired. Please reconnect."
                 )
-            creds.expiry = _as_naive_utc(creds.expiry)
-            
-            update_query = (
-                self.supabase.table("calendar_accounts")
-                .update({
-                    "access_token": creds.token,
-                    "expires_at": _isoformat_utc(creds.expiry)
-                })
-                .eq("user_id", self.user_id)
-                .eq("provider", "google")
-            )
-            
-            account_id = self.external_account_id or self._resolved_account_id
-            if account_id:
-                update_query = update_query.eq("external_account_id", account_id)
-            
-            update_query.execute()
     
     def get_service(self):
         self.refresh_token_if_needed()
         if not self.service:
-            self.service = build('calendar', 'v3', credentials=self.credentials)
+            self.service = build_calendar_service(self.credentials)
         return self.service
     
     def list_calendars(self):
@@ -227,80 +433,174 @@ class GoogleCalendarService:
                 detail="Failed to fetch calendars"
             )
     
+    def list_calendar_changes(self, sync_token: Optional[str] = None) -> dict:
+        """Page through calendarList; with a sync token only changed entries (including deleted/hidden) come back.
+
+        Returns items, the next sync token, and whether this was a full listing
+        (no token, or the token expired with 410 Gone).
+        """
+        items = []
+        page_token = None
+        while True:
+            params = {"maxResults": 250}
+            if sync_token:
+                params["syncToken"] = sync_token
+            if page_token:
+                params["pageToken"] = page_token
+            try:
+                result = self._execute_with_retry(
+                    lambda svc: svc.calendarList().list(**params).execute(),
+                    "list calendars"
+                )
+            except HttpError as error:
+                if sync_token and error.resp.status == 410:
+                    return self.list_calendar_changes(None)
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Failed to fetch calendars"
+                )
+            items.extend(result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return {"items": items, "next_sync_token": result.get("nextSyncToken"), "full": not sync_token}
+
+    def batch_get_events(self, calendar_id: str, event_ids) -> dict:
+        """Fetch events by id through the batch endpoint; missing events map to None.
+
+        Batches are capped at the limiter's burst so each is charged its full
+        cost. Items throttled inside a batch (429, 403 rateLimitExceeded) are
+        retried in a later sub-batch after the same backoff as whole requests.
+        """
+        results = {}
+        batch_size = max(1, min(GOOGLE_BATCH_SIZE, settings.GOOGLE_RATE_LIMIT_BURST))
+        pending = list(event_ids)
+        throttled_attempts = 0
+        while pending:
+            throttled = []
+            retry_after = None
+            for offset in range(0, len(pending), batch_size):
+                chunk = pending[offset:offset + batch_size]
+                chunk_results = {}
+
+                def _callback(request_id, response, exception):
+                    if exception is None:
+                        chunk_results[request_id] = response
+                        return
+                    if isinstance(exception, HttpError) and exception.resp.status == 404:
+                        chunk_results[request_id] = None
+                        return
+                    chunk_results[request_id] = exception
+
+                def _run_batch(svc):
+                    chunk_results.clear()
+                    batch = svc.new_batch_http_request(callback=_callback)
+                    for event_id in chunk:
+                        batch.add(
+                            self._append_conference_data_version(
+                                svc.events().get(calendarId=calendar_id, eventId=event_id, fields=EVENT_FIELDS)
+                            ),
+                            request_id=event_id
+                        )
+                    batch.execute()
+
+                try:
+                    self._execute_with_retry(_run_batch, f"batch fetch {len(chunk)} events", retries=2, cost=len(chunk))
+                except HTTPException:
+                    results.update({event_id: None for event_id in chunk})
+                    continue
+
+                for event_id in chunk:
+                    outcome = chunk_results.get(event_id)
+                    if isinstance(outcome, HttpError):
+                        if is_rate_limit_error(outcome) and throttled_attempts < settings.GOOGLE_RATE_LIMIT_RETRIES:
+                            throttled.append(event_id)
+                            item_retry_after = retry_after_seconds(outcome)
+                            if item_retry_after is not None:
+                                retry_after = max(retry_after or 0.0, item_retry_after)
+                            continue
+                        raise outcome
+                    results[event_id] = None if isinstance(outcome, Exception) else outcome
+
+            if throttled:
+                throttled_attempts += 1
+                delay = backoff_delay(throttled_attempts, retry_after)
+                get_rate_limiter(self.user_id, self._resolved_account_id or self.external_account_id).on_throttled(delay)
+                google_api_metrics.record(throttled_responses=len(throttled), retries=1, backoff_seconds=delay)
+                logger.info("Google rate limit on %d batched events; retrying in %.2fs", len(throttled), delay)
+                time.sleep(delay)
+            pending = throttled
+        return results
+    
+    def _fetch_calendar_events(self, calendar_id: str, time_min: str, time_max: str) -> list:
+        events_result = self._execute_with_retry(
+            lambda svc: self._append_conference_data_version(
+                svc.events().list(
+                    calendarId=calendar_id,
+                    timeMin=time_min,
+                    timeMax=time_max,
+                    singleEvents=True,
+                    orderBy='startTime',
+                    fields=EVENT_LIST_FIELDS
+                )
+            ).execute(),
+            f"fetch events for calendar {calendar_id}"
+        )
+        events = events_result.get('items', [])
+        master_cache = {}
+        to_fetch_master_ids = set()
+        for event in events:
+            recurring_id = event.get('recurringEventId')
+            has_rule = bool(event.get('recurrence'))
+            private_props = event.get('extendedProperties', {}).get('private', {})
+            if recurring_id and not has_rule and not private_props.get('recurrenceRule'):
+                to_fetch_master_ids.add(recurring_id)
+
+        if to_fetch_master_ids:
+            master_cache = self.batch_get_events(calendar_id, to_fetch_master_ids)
+
+        processed_events = []
+        for event in events:
+            status_value = (event.get('status') or '').lower()
+            if status_value == 'cancelled':
+                continue
+            event['calendar_id'] = calendar_id
+            recurring_id = event.get('recurringEventId')
+            master = master_cache.get(recurring_id)
+            if master:
+                if master.get('recurrence') and not event.get('recurrence'):
+                    event['recurrence'] = master['recurrence']
+                master_private = master.get('extendedProperties', {}).get('private', {})
+                if master_private:
+                    event.setdefault('extendedProperties', {}).setdefault('private', {}).update({
+                        k: master_private[k]
+                        for k in ['recurrenceRule', 'recurrenceSummary', 'recurrenceMeta']
+                        if k in master_private
+                    })
+            resolved_location = _resolve_event_meeting_location(event)
+            if resolved_location:
+                event['location'] = resolved_location
+
+            processed_events.append(event)
+
+        return processed_events
+    
     def fetch_events(self, time_min: str, time_max: str, calendar_ids: list = None):
         try:
             if not calendar_ids:
                 calendar_ids = ['primary']
 
-            all_events = []
-            for calendar_id in calendar_ids:
-                events_result = self._execute_with_retry(
-                    lambda svc: self._append_conference_data_version(
-                        svc.events().list(
-                            calendarId=calendar_id,
-                            timeMin=time_min,
-                            timeMax=time_max,
-                            singleEvents=True,
-                            orderBy='startTime'
-                        )
-                    ).execute(),
-                    f"fetch events for calendar {calendar_id}"
-                )
-                events = events_result.get('items', [])
-                master_cache = {}
-                to_fetch_master_ids = set()
-                for event in events:
-                    recurring_id = event.get('recurringEventId')
-                    has_rule = bool(event.get('recurrence'))
-                    private_props = event.get('extendedProperties', {}).get('private', {})
-                    if recurring_id and not has_rule and not private_props.get('recurrenceRule'):
-                        to_fetch_master_ids.add(recurring_id)
-
-                for recurring_id in to_fetch_master_ids:
-                    try:
-                        master = self._execute_with_retry(
-                            lambda svc, rid=recurring_id: self._append_conference_data_version(
-                                svc.events().get(
-                                    calendarId=calendar_id,
-                                    eventId=rid
-                                )
-                            ).execute(),
-                            f"fetch master event {recurring_id}",
-                            retries=2
-                        )
-                        master_cache[recurring_id] = master
-                    except HttpError as error:
-                        if error.resp.status == 404:
-                            master_cache[recurring_id] = None
-                            continue
-                        raise
-                    except HTTPException:
-                        master_cache[recurring_id] = None
-
-                processed_events = []
-                for event in events:
-                    status_value = (event.get('status') or '').lower()
-                    if status_value == 'cancelled':
-                        continue
-                    event['calendar_id'] = calendar_id
-                    recurring_id = event.get('recurringEventId')
-                    master = master_cache.get(recurring_id)
-                    if master:
-                        if master.get('recurrence') and not event.get('recurrence'):
-                            event['recurrence'] = master['recurrence']
-                        master_private = master.get('extendedProperties', {}).get('private', {})
-                        if master_private:
-                            event.setdefault('extendedProperties', {}).setdefault('private', {}).update({
-                                k: master_private[k]
-                                for k in ['recurrenceRule', 'recurrenceSummary', 'recurrenceMeta']
-                                if k in master_private
-                            })
-                    resolved_location = _resolve_event_meeting_location(event)
-                    if resolved_location:
-                        event['location'] = resolved_location
-
-                    processed_events.append(event)
+            if len(calendar_ids) == 1:
+                results = [self._fetch_calendar_events(calendar_ids[0], time_min, time_max)]
+            else:
+                max_workers = max(1, min(settings.GOOGLE_FETCH_CONCURRENCY, len(calendar_ids)))
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    results = list(pool.map(
+                        lambda calendar_id: self._fetch_calendar_events(calendar_id, time_min, time_max),
+                        calendar_ids
+                    ))
 
+            all_events = []
+            for processed_events in results:
                 all_events.extend(processed_events)
 
             return all_events
@@ -424,6 +724,31 @@ class GoogleCalendarService:
                 detail="Failed to update event response"
             )
     
+    def watch_events(self, calendar_id: str, channel_id: str, address: str, token: str, ttl_seconds: int) -> dict:
+        """Open an events.watch push channel; raises HttpError if the calendar does not support push."""
+        body = {
+            "id": channel_id,
+            "type": "web_hook",
+            "address": address,
+            "token": token,
+            "params": {"ttl": str(ttl_seconds)},
+        }
+        return self._execute_with_retry(
+            lambda svc: svc.events().watch(calendarId=calendar_id, body=body).execute(),
+            f"watch events for {calendar_id}"
+        )
+
+    def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        try:
+            self._execute_with_retry(
+                lambda svc: svc.channels().stop(body={"id": channel_id, "resourceId": resource_id}).execute(),
+                f"stop channel {channel_id}"
+            )
+        except HttpError as error:
+            if getattr(getattr(error, "resp", None), "status", None) in (404, 410):
+                return
+            raise
+
     def delete_event(self, event_id: str, calendar_id: str):
         try:
             service = self.get_service()
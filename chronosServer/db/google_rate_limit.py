@@ -0,0 +1,145 @@
+import json
+import random
+import threading
+import time
+from typing import Optional
+from googleapiclient.errors import HttpError
+from config import settings
+
+_RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded"}
+
+
+class AccountRateLimiter:
+    """Token bucket for one Google account that halves its rate on throttling and recovers slowly."""
+
+    def __init__(self, rate: float, burst: int):
+        self._max_rate = rate
+        self._min_rate = max(rate / 16, 0.1)
+        self._rate = rate
+        self._burst = max(1, burst)
+        self._tokens = float(self._burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self.throttled_responses = 0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def acquire(self, cost: int = 1) -> float:
+        """Block until `cost` tokens are available; returns seconds spent waiting."""
+        cost = min(max(1, cost), self._burst)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    self.waited_seconds += waited
+                    return waited
+                delay = (cost - self._tokens) / self._rate
+            time.sleep(delay)
+            waited += delay
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self._rate < self._max_rate:
+                self._rate = min(self._max_rate, self._rate + self._max_rate / 20)
+
+    def on_throttled(self, backoff_seconds: float) -> None:
+        with self._lock:
+            self.throttled_responses += 1
+            self.backoff_seconds += backoff_seconds
+            self._rate = max(self._min_rate, self._rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_second": round(self._rate, 2),
+                "limiter_wait_seconds": round(self.waited_seconds, 3),
+                "backoff_seconds": round(self.backoff_seconds, 3),
+                "throttled_responses": self.throttled_responses,
+            }
+
+
+class GoogleApiMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0,
+            "retries": 0,
+            "throttled_responses": 0,
+            "limiter_wait_seconds": 0.0,
+            "backoff_seconds": 0.0,
+            "bytes_received": 0,
+            "gzip_responses": 0,
+        }
+
+    def record(self, **increments) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: round(value, 3) if isinstance(value, float) else value for name, value in self._counters.items()}
+
+
+google_api_metrics = GoogleApiMetrics()
+
+_limiters_lock = threading.Lock()
+_limiters: dict[tuple, AccountRateLimiter] = {}
+
+
+def get_rate_limiter(user_id: str, account_id: Optional[str]) -> AccountRateLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get((user_id, account_id))
+        if limiter is None:
+            limiter = _limiters[(user_id, account_id)] = AccountRateLimiter(
+                settings.GOOGLE_RATE_LIMIT_PER_SECOND,
+                settings.GOOGLE_RATE_LIMIT_BURST
+            )
+        return limiter
+
+
+def rate_limits_for_user(user_id: str) -> dict:
+    with _limiters_lock:
+        limiters = {key[1]: limiter for key, limiter in _limiters.items() if key[0] == user_id}
+    return {account_id or "default": limiter.stats() for account_id, limiter in limiters.items()}
+
+
+def _error_reasons(error: HttpError) -> set:
+    try:
+        payload = json.loads(error.content.decode("utf-8") if isinstance(error.content, bytes) else error.content)
+    except (TypeError, ValueError, AttributeError):
+        return set()
+    details = (payload.get("error") or {}).get("errors") or []
+    return {detail.get("reason") for detail in details if isinstance(detail, dict)}
+
+
+def is_rate_limit_error(error: HttpError) -> bool:
+    status_code = getattr(getattr(error, "resp", None), "status", None)
+    if status_code == 429:
+        return True
+    return status_code == 403 and bool(_error_reasons(error) & _RATE_LIMIT_REASONS)
+
+
+def retry_after_seconds(error: HttpError) -> Optional[float]:
+    resp = getattr(error, "resp", None)
+    value = resp.get("retry-after") if resp is not None else None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+    ceiling = min(settings.GOOGLE_BACKOFF_MAX_SECONDS, settings.GOOGLE_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, settings.GOOGLE_BACKOFF_MAX_SECONDS))
+    return delay
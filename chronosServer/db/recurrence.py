@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+from zoneinfo import ZoneInfo
+from dateutil.rrule import rrulestr
+from config import settings
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def timestamp_key(value) -> Optional[str]:
+    """Canonical UTC key so stored and expanded timestamps compare equal."""
+    parsed = parse_timestamp(value) if isinstance(value, str) else value
+    if parsed is None:
+        return None
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def default_expansion_window(now: Optional[datetime] = None) -> tuple[datetime, datetime]:
+    now = now or datetime.now(timezone.utc)
+    return (
+        now - timedelta(days=settings.RECURRENCE_WINDOW_PAST_DAYS),
+        now + timedelta(days=settings.RECURRENCE_WINDOW_FUTURE_DAYS),
+    )
+
+
+def _to_utc_value(value: str, dtstart: datetime) -> Optional[str]:
+    """Render a floating or date-only iCalendar value as UTC, in DTSTART's zone and time of day."""
+    try:
+        if "T" in value.upper():
+            moment = datetime.strptime(value.upper(), "%Y%m%dT%H%M%S").replace(tzinfo=dtstart.tzinfo)
+        else:
+            moment = datetime.combine(datetime.strptime(value, "%Y%m%d").date(), dtstart.timetz())
+    except ValueError:
+        return None
+    return moment.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _normalize_line(line: str, dtstart: datetime) -> str:
+    """Make UNTIL/EXDATE/RDATE values UTC; dateutil rejects floating or date values with an aware DTSTART."""
+    head, _, value = line.partition(":")
+    name, *params = head.split(";")
+    name = name.upper()
+    if not value:
+        return line
+    if name in ("RRULE", "EXRULE"):
+        parts = []
+        for part in value.split(";"):
+            key, _, until = part.partition("=")
+            if key.upper() == "UNTIL" and until and not until.upper().endswith("Z"):
+                if "T" not in until.upper():
+                    # A date UNTIL includes that whole day.
+                    until = f"{until}T235959"
+                until = _to_utc_value(until, dtstart) or until
+                part = f"{key}={until}"
+            parts.append(part)
+        return f"{head}:{';'.join(parts)}"
+    if name in ("EXDATE", "RDATE") and not any(param.upper().startswith("TZID=") for param in params):
+        values = []
+        for item in value.split(","):
+            item = item.strip()
+            values.append(item if item.upper().endswith("Z") else (_to_utc_value(item, dtstart) or item))
+        return f"{name}:{','.join(values)}"
+    return line
+
+
+def expand_occurrences(
+    recurrence: Iterable[str],
+    start_ts: datetime,
+    end_ts: datetime,
+    window_start: datetime,
+    window_end: datetime,
+    time_zone: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list[tuple[datetime, datetime]]:
+    """Return (start, end) pairs in UTC for occurrences starting inside the window.
+
+    RRULE, EXRULE, RDATE and EXDATE lines are honoured. Expansion runs in the
+    event's own time zone so wall-clock times survive DST transitions.
+    """
+    lines = [line.strip() for line in recurrence if isinstance(line, str) and line.strip()]
+    if not lines:
+        return []
+    limit = limit or settings.RECURRENCE_MAX_INSTANCES
+
+    zone = timezone.utc
+    if time_zone:
+        try:
+            zone = ZoneInfo(time_zone)
+        except Exception:
+            zone = timezone.utc
+
+    dtstart = start_ts.astimezone(zone)
+    duration = end_ts - start_ts
+    lines = [_normalize_line(line, dtstart) for line in lines]
+    rule = rrulestr("\n".join(lines), dtstart=dtstart, forceset=True)
+
+    occurrences = []
+    for occurrence_start in rule.xafter(window_start.astimezone(zone), count=limit, inc=True):
+        if occurrence_start.tzinfo is None:
+            occurrence_start = occurrence_start.replace(tzinfo=zone)
+        if occurrence_start > window_end:
+            break
+        occurrence_utc = occurrence_start.astimezone(timezone.utc)
+        occurrences.append((occurrence_utc, occurrence_utc + duration))
+    return occurrences
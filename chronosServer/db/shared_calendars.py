@@ -0,0 +1,75 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+from config import settings
+from db.calendar_sync import CalendarSyncService, google_sync_slot
+from db.recurrence import parse_timestamp
+
+# Owners and writers see private event details; readers and free/busy readers do not.
+FULL_ACCESS_ROLES = {"owner", "writer"}
+
+_calendar_locks: dict[tuple, threading.Lock] = {}
+_calendar_locks_lock = threading.Lock()
+
+
+def shared_calendars_enabled() -> bool:
+    return settings.SYNC_SHARED_CALENDARS
+
+
+def access_tier(access_role: Optional[str]) -> str:
+    return "full" if access_role in FULL_ACCESS_ROLES else (access_role or "reader")
+
+
+def _calendar_lock(key: tuple) -> threading.Lock:
+    with _calendar_locks_lock:
+        return _calendar_locks.setdefault(key, threading.Lock())
+
+
+def sync_calendar_for_subscribers(sync_service: CalendarSyncService, calendar_id: UUID, google_calendar_id: str) -> dict:
+    """Delta-sync one calendar and fan the pages out to other users subscribed at the same access tier.
+
+    Only subscribers whose access role exposes the same event detail share a
+    fetch, so a reader never receives what an owner's credentials can see.
+    Subscribers updated by another user's fetch within SYNC_SHARED_FRESH_SECONDS
+    are skipped instead of fetching again. The account's Google sync slot is
+    taken here, after the calendar lock and freshness check, so callers waiting
+    on a popular shared calendar do not hold slots while they wait.
+    """
+    if not shared_calendars_enabled():
+        return _delta_sync(sync_service, calendar_id, google_calendar_id)
+
+    rows = (
+        sync_service.supabase.table("connected_calendars")
+        .select("id,user_id,external_account_id,access_role")
+        .eq("provider_calendar_id", google_calendar_id)
+        .execute()
+    ).data or []
+    own = next((row for row in rows if row["id"] == str(calendar_id)), None)
+    if own is None:
+        return _delta_sync(sync_service, calendar_id, google_calendar_id)
+    tier = access_tier(own.get("access_role"))
+    peers = [
+        row for row in rows
+        if row["id"] != own["id"] and row.get("user_id") and access_tier(row.get("access_role")) == tier
+    ]
+    if not peers:
+        return _delta_sync(sync_service, calendar_id, google_calendar_id)
+
+    # Concurrent syncs of the same calendar wait here, then find it fresh.
+    with _calendar_lock((google_calendar_id, tier)):
+        shared_synced_at = parse_timestamp(sync_service.sync_state(calendar_id).get("shared_synced_at"))
+        fresh_after = datetime.now(timezone.utc) - timedelta(seconds=settings.SYNC_SHARED_FRESH_SECONDS)
+        if shared_synced_at and shared_synced_at > fresh_after:
+            return {"status": "completed", "events_synced": 0, "shared_skipped": 1}
+
+        fanout = [
+            (CalendarSyncService(row["user_id"], row.get("external_account_id"), sync_service.supabase), row["id"])
+            for row in peers
+        ]
+        return _delta_sync(sync_service, calendar_id, google_calendar_id, fanout)
+
+
+def _delta_sync(sync_service: CalendarSyncService, calendar_id: UUID, google_calendar_id: str, fanout: Optional[list] = None) -> dict:
+    with google_sync_slot(sync_service.user_id, sync_service.external_account_id):
+        return sync_service.delta_sync(calendar_id, google_calendar_id, fanout=fanout)
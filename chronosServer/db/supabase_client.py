@@ -1,6 +1,63 @@
-from supabase import create_client, Client
+import threading
+import time
+from typing import Optional
+import httpx
+from supabase import create_client, Client, ClientOptions
 from config import settings
 
-def get_supabase_client() -> Client:
-    """Create a fresh Supabase client per request to avoid HTTP/2 connection pooling issues."""
+_pool_lock = threading.Lock()
+_pooled_client: Optional[Client] = None
+_pooled_created_at = 0.0
+_pooled_last_used_at = 0.0
+
+
+def create_supabase_client() -> Client:
+    """Create an isolated Supabase client (use for flows that mutate auth session state)."""
     return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+
+
+def _create_pooled_client() -> Client:
+    # httpx keeps only 20 keep-alive connections by default, far fewer than the
+    # threadpool's concurrent handlers; size the pool so they do not queue on it.
+    limits = httpx.Limits(
+        max_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.SUPABASE_POOL_MAX_CONNECTIONS
+    )
+    http_client = httpx.Client(limits=limits, timeout=120, follow_redirects=True, http2=True)
+    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY, ClientOptions(httpx_client=http_client))
+
+
+def _is_stale(now: float) -> bool:
+    if _pooled_client is None:
+        return True
+    if now - _pooled_created_at > settings.SUPABASE_POOL_MAX_AGE_SECONDS:
+        return True
+    # PostgREST drops idle HTTP/2 connections; rebuild before reusing a likely-dead socket.
+    return now - _pooled_last_used_at > settings.SUPABASE_POOL_IDLE_SECONDS
+
+
+def get_supabase_client() -> Client:
+    """Return the process-wide Supabase client, recycling it when idle or too old."""
+    global _pooled_client, _pooled_created_at, _pooled_last_used_at
+    now = time.monotonic()
+    with _pool_lock:
+        if _is_stale(now):
+            _pooled_client = _create_pooled_client()
+            _pooled_created_at = now
+        _pooled_last_used_at = now
+        return _pooled_client
+
+
+def recycle_supabase_client(client: Optional[Client] = None) -> None:
+    """Drop the pooled client so the next checkout opens fresh connections."""
+    global _pooled_client
+    with _pool_lock:
+        if client is None or client is _pooled_client:
+            _pooled_client = None
+
+
+def is_connection_error(error: BaseException) -> bool:
+    if isinstance(error, (httpx.RemoteProtocolError, httpx.ConnectError, httpx.ReadError, httpx.WriteError)):
+        return True
+    message = str(error).lower()
+    return "disconnected" in message or "connectionterminated" in message
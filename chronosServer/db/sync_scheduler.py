@@ -0,0 +1,154 @@
+import itertools
+import logging
+import queue
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+PRIORITY_BACKFILL = 20
+
+_RECENT_JOBS_PER_USER = 20
+# Users whose finished jobs are remembered; the least recently synced are evicted first.
+_RECENT_USERS = 1000
+
+
+class SyncJob:
+    def __init__(self, key: tuple, user_id: str, kind: str, fn: Callable[[], Any], priority: int):
+        self.key = key
+        self.user_id = user_id
+        self.kind = kind
+        self.priority = priority
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at = None
+        self.finished_at = None
+        self._fn = fn
+        self._done = threading.Event()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
+
+
+class SyncScheduler:
+    """Bounded worker pool for sync work with per-key de-duplication and priorities.
+
+    Interactive jobs also go to a reserved lane with its own workers, so a full
+    pool of long backfills cannot starve a foreground sync.
+    """
+
+    def __init__(self, max_workers: int, interactive_workers: int = 1):
+        self._max_workers = max(1, max_workers)
+        self._max_interactive_workers = max(1, interactive_workers)
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._interactive_queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._active: dict[tuple, SyncJob] = {}
+        self._recent: OrderedDict[str, deque] = OrderedDict()
+        self._workers: list[threading.Thread] = []
+        self._interactive_workers: list[threading.Thread] = []
+
+    def submit(
+        self,
+        key: tuple,
+        user_id: str,
+        kind: str,
+        fn: Callable[[], Any],
+        priority: int = PRIORITY_BACKGROUND
+    ) -> SyncJob:
+        """Queue a job, or join the queued/running job that already owns this key."""
+        with self._lock:
+            existing = self._active.get(key)
+            if existing is not None:
+                if existing.status == "queued" and priority < existing.priority:
+                    # Re-enqueue at the higher priority; workers skip the stale entry.
+                    existing.priority = priority
+                    self._enqueue(existing)
+                return existing
+            job = SyncJob(key, user_id, kind, fn, priority)
+            self._active[key] = job
+            self._enqueue(job)
+            self._ensure_workers()
+            return job
+
+    def _enqueue(self, job: SyncJob) -> None:
+        entry = (job.priority, next(self._sequence), job)
+        self._queue.put(entry)
+        if job.priority <= PRIORITY_INTERACTIVE:
+            # Whichever lane picks it up first runs it; the other skips the entry.
+            self._interactive_queue.put(entry)
+
+    def jobs_for_user(self, user_id: str) -> list[dict]:
+        with self._lock:
+            active = [job for job in self._active.values() if job.user_id == user_id]
+            recent = list(self._recent.get(user_id, ()))
+        return [job.to_dict() for job in active + recent]
+
+    def _remember(self, job: SyncJob) -> None:
+        # Caller holds self._lock.
+        recent = self._recent.pop(job.user_id, None) or deque(maxlen=_RECENT_JOBS_PER_USER)
+        recent.appendleft(job)
+        self._recent[job.user_id] = recent
+        while len(self._recent) > _RECENT_USERS:
+            self._recent.popitem(last=False)
+
+    def _ensure_workers(self) -> None:
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+        while len(self._workers) < self._max_workers:
+            worker = threading.Thread(target=self._work, args=(self._queue,), name=f"sync-worker-{len(self._workers)}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        self._interactive_workers = [worker for worker in self._interactive_workers if worker.is_alive()]
+        while len(self._interactive_workers) < self._max_interactive_workers:
+            worker = threading.Thread(
+                target=self._work,
+                args=(self._interactive_queue,),
+                name=f"sync-interactive-worker-{len(self._interactive_workers)}",
+                daemon=True
+            )
+            worker.start()
+            self._interactive_workers.append(worker)
+
+    def _work(self, jobs: queue.PriorityQueue) -> None:
+        while True:
+            _, _, job = jobs.get()
+            with self._lock:
+                if job.status != "queued":
+                    continue
+                job.status = "running"
+                job.started_at = datetime.now(timezone.utc)
+            final_status = "completed"
+            try:
+                job.result = job._fn()
+            except Exception as e:
+                logger.warning("Sync job %s failed: %s", job.key, e)
+                job.error = str(e)
+                final_status = "error"
+            with self._lock:
+                job.status = final_status
+                job.finished_at = datetime.now(timezone.utc)
+                self._active.pop(job.key, None)
+                self._remember(job)
+            job._done.set()
+
+
+sync_scheduler = SyncScheduler(settings.SYNC_MAX_WORKERS, settings.SYNC_INTERACTIVE_WORKERS)
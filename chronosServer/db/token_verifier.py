@@ -0,0 +1,144 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+import httpx
+from jose import jwt
+from jose.exceptions import JWTError
+from config import settings
+from models.user import User
+
+_JWKS_PATH = "/auth/v1/.well-known/jwks.json"
+_JWKS_MIN_REFRESH_INTERVAL = 30
+_ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
+
+class LocalVerificationUnavailable(Exception):
+    """Raised when a token cannot be verified locally and needs the remote check."""
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class _SigningKeyCache:
+    def __init__(self):
+        self._keys: dict[str, dict] = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    async def _fetch(self) -> None:
+        url = settings.SUPABASE_URL.rstrip("/") + _JWKS_PATH
+        async with httpx.AsyncClient(timeout=5) as client:
+            resp = await client.get(url, headers={"apikey": settings.SUPABASE_KEY})
+            resp.raise_for_status()
+            keys = resp.json().get("keys") or []
+        with self._lock:
+            self._keys = {k["kid"]: k for k in keys if k.get("kid")}
+            self._fetched_at = time.monotonic()
+
+    async def get(self, kid: str) -> Optional[dict]:
+        now = time.monotonic()
+        age = now - self._fetched_at
+        key = self._keys.get(kid)
+        # Refresh on TTL expiry, or on an unknown kid (key rotation) at a bounded rate.
+        if age > settings.AUTH_JWKS_TTL_SECONDS or (key is None and age > _JWKS_MIN_REFRESH_INTERVAL):
+            try:
+                await self._fetch()
+            except Exception:
+                return key
+            key = self._keys.get(kid)
+        return key
+
+
+class _VerifiedTokenCache:
+    def __init__(self, max_size: int):
+        self._entries: OrderedDict[str, tuple[User, float]] = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[User]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return user
+
+    def put(self, token: str, user: User, token_exp: Optional[float] = None) -> None:
+        expires_at = time.time() + settings.AUTH_TOKEN_CACHE_TTL_SECONDS
+        if token_exp:
+            expires_at = min(expires_at, token_exp)
+        with self._lock:
+            self._entries[token] = (user, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+
+_signing_keys = _SigningKeyCache()
+verified_tokens = _VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def _user_from_claims(claims: dict) -> User:
+    metadata = claims.get("user_metadata") or {}
+    last_sign_in = None
+    amr = claims.get("amr") or []
+    timestamps = [entry.get("timestamp") for entry in amr if isinstance(entry, dict) and entry.get("timestamp")]
+    if timestamps:
+        last_sign_in = datetime.fromtimestamp(max(timestamps), tz=timezone.utc).isoformat()
+    return User(
+        id=str(claims["sub"]),
+        email=claims.get("email"),
+        name=metadata.get("name") or metadata.get("full_name"),
+        avatar_url=metadata.get("picture"),
+        last_login_at=last_sign_in
+    )
+
+
+def unverified_expiry(token: str) -> Optional[float]:
+    try:
+        return jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+
+
+async def verify_access_token(token: str) -> tuple[User, Optional[float]]:
+    """Verify a Supabase access token locally; returns the user and token expiry."""
+    try:
+        header = jwt.get_unverified_header(token)
+    except JWTError as error:
+        raise InvalidToken(str(error))
+
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        if not settings.SUPABASE_JWT_SECRET:
+            raise LocalVerificationUnavailable("HS256 secret not configured")
+        key = settings.SUPABASE_JWT_SECRET
+    elif algorithm in _ASYMMETRIC_ALGORITHMS:
+        kid = header.get("kid")
+        key = await _signing_keys.get(kid) if kid else None
+        if key is None:
+            raise LocalVerificationUnavailable(f"unknown signing key {kid!r}")
+        if key.get("alg") and key["alg"] != algorithm:
+            raise InvalidToken("token algorithm does not match signing key")
+    else:
+        raise LocalVerificationUnavailable(f"unsupported algorithm {algorithm!r}")
+
+    try:
+        claims = jwt.decode(token, key, algorithms=[algorithm], audience="authenticated")
+    except JWTError as error:
+        raise InvalidToken(str(error))
+
+    if not claims.get("sub") or not claims.get("email"):
+        raise LocalVerificationUnavailable("token lacks user claims")
+    return _user_from_claims(claims), claims.get("exp")
@@ -0,0 +1,327 @@
+import hmac
+import logging
+import os
+import secrets
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from supabase import Client
+from googleapiclient.errors import HttpError
+from config import settings
+from db.calendar_sync import CalendarSyncService, google_sync_slot
+from db.recurrence import parse_timestamp
+from db.shared_calendars import sync_calendar_for_subscribers
+from db.supabase_client import get_supabase_client
+from db.sync_scheduler import sync_scheduler, PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+CHANNELS_TABLE = "calendar_watch_channels"
+CLAIMS_TABLE = "background_task_claims"
+RENEWAL_TASK = "watch_renewal"
+SYSTEM_USER = "system"
+# Identifies this process when claiming tasks that only one worker should run.
+RUNNER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+_channel_cache: dict[str, dict] = {}
+_channel_cache_lock = threading.Lock()
+
+
+def watching_enabled() -> bool:
+    return bool(settings.GOOGLE_WEBHOOK_URL)
+
+
+def _expiration_from_ms(value) -> Optional[str]:
+    try:
+        return datetime.fromtimestamp(int(value) / 1000, tz=timezone.utc).isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _renewal_cutoff() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.GOOGLE_WATCH_RENEWAL_MARGIN_SECONDS)
+
+
+def _forget_channel(channel_id: str) -> None:
+    with _channel_cache_lock:
+        _channel_cache.pop(channel_id, None)
+
+
+def lookup_channel(channel_id: str, supabase: Optional[Client] = None) -> Optional[dict]:
+    with _channel_cache_lock:
+        channel = _channel_cache.get(channel_id)
+    if channel is not None:
+        return channel
+    supabase = supabase or get_supabase_client()
+    res = (
+        supabase.table(CHANNELS_TABLE)
+        .select("*")
+        .eq("channel_id", channel_id)
+        .maybe_single()
+        .execute()
+    )
+    channel = res.data if res else None
+    if channel:
+        with _channel_cache_lock:
+            _channel_cache[channel_id] = channel
+    return channel
+
+
+def _stop_channel(sync_service: CalendarSyncService, channel: dict) -> None:
+    _forget_channel(channel["channel_id"])
+    try:
+        if channel.get("resource_id"):
+            sync_service.google_service.stop_channel(channel["channel_id"], channel["resource_id"])
+    except Exception as e:
+        logger.warning("Failed to stop watch channel %s: %s", channel["channel_id"], e)
+    sync_service.supabase.table(CHANNELS_TABLE).delete().eq("channel_id", channel["channel_id"]).execute()
+
+
+def register_calendar_watch(sync_service: CalendarSyncService, calendar_id, google_calendar_id: str) -> Optional[dict]:
+    """Open a push channel for one calendar and retire any channel it replaces."""
+    if not watching_enabled():
+        return None
+
+    existing = (
+        sync_service.supabase.table(CHANNELS_TABLE)
+        .select("*")
+        .eq("user_id", sync_service.user_id)
+        .eq("calendar_id", str(calendar_id))
+        .execute()
+    ).data or []
+
+    channel_id = str(uuid.uuid4())
+    token = secrets.token_urlsafe(32)
+    try:
+        with google_sync_slot(sync_service.user_id, sync_service.external_account_id):
+            response = sync_service.google_service.watch_events(
+                google_calendar_id,
+                channel_id,
+                settings.GOOGLE_WEBHOOK_URL,
+                token,
+                settings.GOOGLE_WATCH_TTL_SECONDS
+            )
+    except HttpError as e:
+        # Holiday/birthday calendars reject push; they stay on polling.
+        logger.info("Calendar %s does not accept watch channels: %s", google_calendar_id, e)
+        return None
+
+    channel = {
+        "channel_id": channel_id,
+        "resource_id": response.get("resourceId"),
+        "token": token,
+        "user_id": sync_service.user_id,
+        "external_account_id": sync_service.external_account_id,
+        "calendar_id": str(calendar_id),
+        "provider_calendar_id": google_calendar_id,
+        "expiration": _expiration_from_ms(response.get("expiration")),
+    }
+    sync_service.supabase.table(CHANNELS_TABLE).insert(channel).execute()
+    with _channel_cache_lock:
+        _channel_cache[channel_id] = channel
+
+    for old in existing:
+        _stop_channel(sync_service, old)
+    return channel
+
+
+def watched_calendar_ids(user_id: str, supabase: Client) -> set[str]:
+    """Calendars whose channel stays valid past the renewal margin."""
+    if not watching_enabled():
+        return set()
+    res = (
+        supabase.table(CHANNELS_TABLE)
+        .select("calendar_id")
+        .eq("user_id", user_id)
+        .gt("expiration", _renewal_cutoff().isoformat())
+        .execute()
+    )
+    return {row["calendar_id"] for row in res.data or [] if row.get("calendar_id")}
+
+
+def push_synced_calendar_ids(user_id: str, supabase: Client) -> set[str]:
+    """Watched calendars a background sync may skip: those delta-synced within the fallback interval.
+
+    A channel that stops delivering still looks valid, so watched calendars fall
+    back to a low-frequency delta sync once their last one is old enough.
+    """
+    watched = watched_calendar_ids(user_id, supabase)
+    if not watched:
+        return set()
+    fresh_after = datetime.now(timezone.utc) - timedelta(seconds=settings.GOOGLE_WATCH_FALLBACK_SYNC_SECONDS)
+    res = (
+        supabase.table("event_sync_state")
+        .select("calendar_id,last_delta_sync_at")
+        .eq("user_id", user_id)
+        .in_("calendar_id", list(watched))
+        .execute()
+    )
+    return {
+        row["calendar_id"]
+        for row in res.data or []
+        if (parse_timestamp(row.get("last_delta_sync_at")) or fresh_after) > fresh_after
+    }
+
+
+def register_account_watches(sync_service: CalendarSyncService) -> int:
+    """Open channels for every connected calendar on the account that lacks a fresh one."""
+    if not watching_enabled():
+        return 0
+    calendars = (
+        sync_service.supabase.table("connected_calendars")
+        .select("id,provider_calendar_id,hidden")
+        .eq("user_id", sync_service.user_id)
+        .eq("external_account_id", sync_service.external_account_id)
+        .execute()
+    ).data or []
+    watched = watched_calendar_ids(sync_service.user_id, sync_service.supabase)
+
+    registered = 0
+    for calendar in calendars:
+        if calendar["id"] in watched or calendar.get("hidden") or not calendar.get("provider_calendar_id"):
+            continue
+        try:
+            if register_calendar_watch(sync_service, calendar["id"], calendar["provider_calendar_id"]):
+                registered += 1
+        except Exception as e:
+            logger.warning("Failed to watch calendar %s: %s", calendar["id"], e)
+    return registered
+
+
+def renew_expiring_channels() -> int:
+    """Replace channels that expire within the renewal margin."""
+    supabase = get_supabase_client()
+    if not claim_renewal_runner(supabase):
+        return 0
+    expiring = (
+        supabase.table(CHANNELS_TABLE)
+        .select("*")
+        .lt("expiration", _renewal_cutoff().isoformat())
+        .execute()
+    ).data or []
+
+    services: dict[tuple, CalendarSyncService] = {}
+    renewed = 0
+    for channel in expiring:
+        account_key = (channel["user_id"], channel.get("external_account_id"))
+        sync_service = services.get(account_key)
+        if sync_service is None:
+            sync_service = services[account_key] = CalendarSyncService(*account_key, supabase)
+        try:
+            if register_calendar_watch(sync_service, channel["calendar_id"], channel["provider_calendar_id"]):
+                renewed += 1
+            else:
+                _stop_channel(sync_service, channel)
+            # Close any gap between the old channel lapsing and the new one starting.
+            notification_debouncer.notify(channel)
+        except Exception as e:
+            logger.warning("Failed to renew watch channel %s: %s", channel["channel_id"], e)
+    return renewed
+
+
+def claim_renewal_runner(supabase: Optional[Client] = None) -> bool:
+    """Claim channel renewal for this process; every uvicorn worker runs the loop but only one renews.
+
+    The claim lasts two renewal intervals and is extended on each run, so another
+    worker takes over only after the holder stops renewing.
+    """
+    supabase = supabase or get_supabase_client()
+    now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    claimed_until = datetime.now(timezone.utc) + timedelta(seconds=2 * settings.GOOGLE_WATCH_RENEWAL_INTERVAL_SECONDS)
+    try:
+        supabase.table(CLAIMS_TABLE).upsert(
+            {"task": RENEWAL_TASK, "claimed_by": None, "claimed_until": "1970-01-01T00:00:00Z"},
+            on_conflict="task",
+            ignore_duplicates=True
+        ).execute()
+        res = (
+            supabase.table(CLAIMS_TABLE)
+            .update({"claimed_by": RUNNER_ID, "claimed_until": claimed_until.isoformat()})
+            .eq("task", RENEWAL_TASK)
+            .or_(f'claimed_by.eq."{RUNNER_ID}",claimed_until.lt.{now}')
+            .execute()
+        )
+    except Exception as e:
+        # Without the claims table (migration 007) every worker renews, as before.
+        logger.warning("Watch renewal claim unavailable, renewing in this worker: %s", e)
+        return True
+    return bool(res.data)
+
+
+def schedule_channel_renewal():
+    return sync_scheduler.submit(
+        ("watch_renewal",),
+        SYSTEM_USER,
+        "watch_renewal",
+        renew_expiring_channels,
+        PRIORITY_BACKGROUND
+    )
+
+
+def _sync_watched_calendar(channel: dict) -> dict:
+    sync_service = CalendarSyncService(channel["user_id"], channel.get("external_account_id"), get_supabase_client())
+    return sync_calendar_for_subscribers(sync_service, channel["calendar_id"], channel["provider_calendar_id"])
+
+
+class NotificationDebouncer:
+    """Coalesce bursts of push notifications into one delta sync per calendar."""
+
+    def __init__(self, delay_seconds: float):
+        self._delay = delay_seconds
+        self._lock = threading.Lock()
+        self._pending: dict[tuple, threading.Timer] = {}
+
+    def notify(self, channel: dict) -> bool:
+        """Arm a sync for the channel's calendar; returns False if one is already pending."""
+        key = (channel["user_id"], channel["calendar_id"])
+        with self._lock:
+            if key in self._pending:
+                return False
+            timer = threading.Timer(self._delay, self._fire, args=(key, channel))
+            timer.daemon = True
+            self._pending[key] = timer
+        timer.start()
+        return True
+
+    def _fire(self, key: tuple, channel: dict) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+        requested_at = datetime.now(timezone.utc)
+        job = sync_scheduler.submit(
+            ("watch_sync", *key),
+            channel["user_id"],
+            "watch_sync",
+            lambda: _sync_watched_calendar(channel),
+            PRIORITY_BACKGROUND
+        )
+        if job.started_at is not None and job.started_at < requested_at:
+            # The running pass may have read its sync token before this change landed.
+            self.notify(channel)
+
+
+notification_debouncer = NotificationDebouncer(settings.GOOGLE_WATCH_DEBOUNCE_SECONDS)
+
+
+def handle_notification(
+    channel_id: Optional[str],
+    resource_id: Optional[str],
+    resource_state: Optional[str],
+    token: Optional[str]
+) -> str:
+    """Validate a Google push notification and schedule a sync; returns the outcome."""
+    if not channel_id:
+        return "ignored"
+    channel = lookup_channel(channel_id)
+    if channel is None:
+        return "unknown_channel"
+    if not hmac.compare_digest(channel.get("token") or "", token or ""):
+        return "invalid_token"
+    if resource_id and channel.get("resource_id") and resource_id != channel["resource_id"]:
+        return "unknown_channel"
+    if resource_state == "sync":
+        return "handshake"
+    if parse_timestamp(channel.get("expiration")) and parse_timestamp(channel["expiration"]) < datetime.now(timezone.utc):
+        return "expired"
+    return "scheduled" if notification_debouncer.notify(channel) else "coalesced"
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Response, Request, Depends, status
-from db.supabase_client import get_supabase_client
+from db.supabase_client import get_supabase_client, create_supabase_client
 from db.auth_dependency import get_current_user
+from db.body_dependency import get_optional_json_body
+from db.token_verifier import verified_tokens
 from supabase import Client
 from config import settings
 from models.user import User
@@ -26,14 +28,15 @@ async def create_session(request: Request, response: Response):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Authentication failed")
 
 @router.post("/refresh")
-async def refresh_token(request: Request, response: Response, supabase: Client = Depends(get_supabase_client)):
+def refresh_token(
+    request: Request,
+    response: Response,
+    body: dict = Depends(get_optional_json_body),
+    supabase: Client = Depends(create_supabase_client)
+):
     refresh_token = request.cookies.get("sb-refresh-token")
 
     if not refresh_token:
-        try:
-            body = await request.json()
-        except Exception:
-            body = {}
         refresh_token = body.get("refresh_token")
     
     if not refresh_token:
@@ -58,7 +61,7 @@ async def refresh_token(request: Request, response: Response, supabase: Client =
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token refresh failed")
 
 @router.get("/me", response_model=User)
-async def get_me(
+def get_me(
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
@@ -77,7 +80,7 @@ async def get_me(
     return user.model_copy(update={"has_google_credentials": has_google_credentials})
 
 @router.post("/logout")
-async def logout(response: Response, request: Request, supabase: Client = Depends(get_supabase_client)):
+def logout(response: Response, request: Request, supabase: Client = Depends(get_supabase_client)):
     """Logout current session"""
     try:
         token = request.cookies.get("sb-access-token")
@@ -88,6 +91,7 @@ async def logout(response: Response, request: Request, supabase: Client = Depend
                 if len(parts) == 2 and parts[0].lower() == "bearer":
                     token = parts[1].strip() or None
         if token:
+            verified_tokens.discard(token)
             user = supabase.auth.get_user(token)
             supabase.table("users").update({
                 "last_logout_at": datetime.utcnow().isoformat()
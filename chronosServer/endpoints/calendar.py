@@ -1,17 +1,22 @@
-from fastapi import APIRouter, HTTPException, Request, Depends, status, Query
-import threading
-from db.supabase_client import get_supabase_client
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Request
+from db.supabase_client import get_supabase_client, recycle_supabase_client, is_connection_error
 from db.auth_dependency import get_current_user
-from db.google_credentials import GoogleCalendarService
-from db.calendar_sync import CalendarSyncService
+from db.body_dependency import get_json_body, get_optional_json_body
+from db.google_credentials import GoogleCalendarService, invalidate_google_credentials
+from db.calendar_sync import CalendarSyncService, google_sync_slot, recurrence_coverage
+from db.shared_calendars import sync_calendar_for_subscribers
+from db.google_rate_limit import rate_limits_for_user
+from db.watch_channels import handle_notification, register_account_watches, push_synced_calendar_ids
+from db.sync_scheduler import sync_scheduler, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_BACKFILL
 from supabase import Client
+from config import settings
 from models.user import User
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 from fastapi.responses import JSONResponse
 from datetime import datetime, timezone, timedelta
 from uuid import UUID
-from starlette.requests import ClientDisconnect
 from urllib.parse import urlparse
 from pydantic import BaseModel
 
@@ -22,6 +27,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/calendar", tags=["Calendar"])
 
+# Scheduler job kinds that walk the backfill window for an account.
+BACKFILL_JOB_KINDS = ("backfill", "full_sync")
+
 class CalendarUpdate(BaseModel):
     color: Optional[str] = None
     selected: Optional[bool] = None
@@ -55,12 +63,12 @@ def _parse_ics_datetime(prop):
     except Exception:
         return None
 
-async def _fetch_ics_events(url: str, start_dt: datetime, end_dt: datetime, calendar_id: str):
+def _fetch_ics_events(url: str, start_dt: datetime, end_dt: datetime, calendar_id: str):
     if not url:
         return []
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(url, headers={"User-Agent": "Chronos/1.0"})
+        with httpx.Client(timeout=15) as client:
+            resp = client.get(url, headers={"User-Agent": "Chronos/1.0"})
             resp.raise_for_status()
             content = resp.content
     except Exception as e:
@@ -146,6 +154,28 @@ def _normalize_event_location(event_data):
         event_data["location"] = normalized
     return event_data
 
+def _extend_recurrences_if_needed(user_id: str, start_dt: datetime, end_dt: datetime, supabase: Client):
+    if start_dt.tzinfo is None:
+        start_dt = start_dt.replace(tzinfo=timezone.utc)
+    if end_dt.tzinfo is None:
+        end_dt = end_dt.replace(tzinfo=timezone.utc)
+
+    for gap_start, gap_end in recurrence_coverage.missing(user_id, start_dt, end_dt):
+        def _background_extend(gap_start=gap_start, gap_end=gap_end):
+            generation = recurrence_coverage.generation(user_id)
+            expanded = CalendarSyncService(user_id, None, supabase).expand_recurrences_for_range(gap_start, gap_end)
+            recurrence_coverage.add(user_id, gap_start, gap_end, generation)
+            return expanded
+
+        # Keyed by span so a request for a new range never joins a job for an older one.
+        sync_scheduler.submit(
+            ("recurrence", user_id, gap_start.isoformat(), gap_end.isoformat()),
+            user_id,
+            "recurrence_expansion",
+            _background_extend,
+            PRIORITY_BACKGROUND
+        )
+
 def _is_uuid(value: str) -> bool:
     try:
         UUID(str(value))
@@ -154,9 +184,8 @@ def _is_uuid(value: str) -> bool:
         return False
 
 @router.post("/credentials")
-async def save_credentials(request: Request, user: User = Depends(get_current_user), supabase: Client = Depends(get_supabase_client)):
+def save_credentials(body: dict = Depends(get_json_body), user: User = Depends(get_current_user), supabase: Client = Depends(get_supabase_client)):
     try:
-        body = await request.json()
         access_token = body.get("access_token")
         refresh_token = body.get("refresh_token")
         expires_at = body.get("expires_at")
@@ -185,23 +214,25 @@ async def save_credentials(request: Request, user: User = Depends(get_current_us
         payload["account_email"] = user.email
         
         result = supabase.table("calendar_accounts").upsert(payload, on_conflict="user_id,provider,external_account_id").execute()
+        invalidate_google_credentials(str(user.id), external_account_id)
         
         sync_service = CalendarSyncService(str(user.id), external_account_id, supabase)
-        calendars = sync_service.google_service.list_calendars()
-        primary_email = None
-        for cal in calendars or []:
-            if cal.get("primary") is True and isinstance(cal.get("id"), str) and "@" in cal.get("id"):
-                primary_email = cal.get("id")
-                break
-        if primary_email:
+        calendar_list = sync_service.sync_calendar_list()
+        primary_email = calendar_list["primary_calendar_id"]
+        if primary_email and "@" in primary_email:
             supabase.table("calendar_accounts").update({"account_email": primary_email}).eq("user_id", str(user.id)).eq("provider", "google").eq("external_account_id", external_account_id).execute()
-        for cal in calendars:
-            cal_id = sync_service.get_calendar_id(cal)
+        for cal_id, _ in calendar_list["targets"]:
             sync_state = sync_service.sync_state(cal_id)
             if sync_state.get('backfill_before_ts'):
                 return JSONResponse(status_code=status.HTTP_200_OK, content={"message": "Credentials saved successfully"})
         
-        sync_service.backfill_calendar()
+        sync_scheduler.submit(
+            ("backfill", str(user.id), external_account_id),
+            str(user.id),
+            "backfill",
+            sync_service.backfill_calendar,
+            PRIORITY_BACKFILL
+        )
         return JSONResponse(
             status_code=status.HTTP_200_OK,
             content={"message": "Credentials saved successfully", "syncing": True}
@@ -210,7 +241,7 @@ async def save_credentials(request: Request, user: User = Depends(get_current_us
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to save credentials")
 
 @router.get("/calendars")
-async def get_calendars(user: User = Depends(get_current_user), supabase: Client = Depends(get_supabase_client)):
+def get_calendars(user: User = Depends(get_current_user), supabase: Client = Depends(get_supabase_client)):
     calendars_result = supabase.table("connected_calendars").select("*").eq("user_id", str(user.id)).execute()
     accounts_result = (
         supabase.table("calendar_accounts")
@@ -235,6 +266,7 @@ async def get_calendars(user: User = Depends(get_current_user), supabase: Client
             "backgroundColor": color,
             "accessRole": cal.get("access_role"),
             "selected": cal.get("selected", True),
+            "hidden": cal.get("hidden", False),
             "external_account_id": cal.get("external_account_id"),
             "account_email": account_email_by_external.get(ext),
         })
@@ -268,7 +300,7 @@ async def get_calendars(user: User = Depends(get_current_user), supabase: Client
     return {"calendars": calendars}
 
 @router.patch("/calendars/{calendar_id}")
-async def update_calendar(
+def update_calendar(
     calendar_id: str,
     calendar_update: CalendarUpdate,
     user: User = Depends(get_current_user),
@@ -318,7 +350,7 @@ async def update_calendar(
     return {"calendar": result.data[0]}
 
 @router.get("/subscriptions")
-async def list_calendar_subscriptions(
+def list_calendar_subscriptions(
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client),
 ):
@@ -336,16 +368,11 @@ async def list_calendar_subscriptions(
 
 
 @router.post("/subscriptions")
-async def create_calendar_subscription(
-    request: Request,
+def create_calendar_subscription(
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client),
 ):
-    try:
-        body = await request.json()
-    except ClientDisconnect:
-        raise HTTPException(status_code=400, detail="Client disconnected")
-
     url = _validate_subscription_url(body.get("url"))
     name = body.get("name")
     color = body.get("color")
@@ -401,7 +428,7 @@ async def create_calendar_subscription(
 
 
 @router.delete("/subscriptions/{subscription_id}")
-async def delete_calendar_subscription(
+def delete_calendar_subscription(
     subscription_id: str,
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client),
@@ -427,7 +454,7 @@ async def delete_calendar_subscription(
         raise HTTPException(status_code=500, detail="Failed to delete subscription")
 
 @router.get("/events")
-async def get_events(
+def get_events(
     start: str = Query(..., description="Start date in ISO format"),
     end: str = Query(..., description="End date in ISO format"),
     calendar_ids: Optional[str] = Query(None, description="Comma-separated calendar IDs"),
@@ -440,7 +467,7 @@ async def get_events(
     if end_dt - start_dt > timedelta(days=max_span_days):
         end_dt = start_dt + timedelta(days=max_span_days)
     
-    calendars_result = supabase.table("connected_calendars").select("*").eq("user_id", str(user.id)).eq("selected", True).execute()
+    calendars_result = supabase.table("connected_calendars").select("*").eq("user_id", str(user.id)).eq("selected", True).eq("hidden", False).execute()
     calendars = calendars_result.data or []
 
     subs = []
@@ -454,6 +481,9 @@ async def get_events(
         return {"events": [], "coverage": {"has_before": False, "has_after": False}, "calendars": [], "last_synced_at": {}}
     
     requested_ids = None
+    if calendars:
+        _extend_recurrences_if_needed(str(user.id), start_dt, end_dt, supabase)
+
     if calendar_ids:
         requested_ids = set([c for c in calendar_ids.split(',') if c])
         calendars = [c for c in calendars if c['id'] in requested_ids]
@@ -471,6 +501,12 @@ async def get_events(
         sync_states_result = supabase.table("event_sync_state").select("*").eq("user_id", str(user.id)).in_("calendar_id", cal_id_list).execute()
         sync_states = {s['calendar_id']: s for s in (sync_states_result.data or [])}
     
+    backfill_active = any(
+        job["kind"] in BACKFILL_JOB_KINDS and job["status"] in ("queued", "running")
+        for job in sync_scheduler.jobs_for_user(str(user.id))
+    )
+    if backfill_active:
+        coverage["backfill_in_progress"] = True
     for calendar_id, sync_state in sync_states.items():
         cal = calendar_map.get(calendar_id)
         if not cal:
@@ -484,6 +520,20 @@ async def get_events(
             coverage["has_before"] = True
         if backfill_after and end_dt > datetime.fromisoformat(backfill_after.replace('Z', '+00:00')):
             coverage["has_after"] = True
+        # Backfill runs near-now first, so the window every calendar has synced grows outward.
+        # Saved progress without a live backfill job means a run stopped early and will resume.
+        if sync_state.get('backfill_progress') and not backfill_active:
+            coverage["backfill_incomplete"] = True
+        if not backfill_before or not backfill_after:
+            coverage["pending_calendars"] = coverage.get("pending_calendars", 0) + 1
+            continue
+        if not coverage.get("synced_start") or backfill_before > coverage["synced_start"]:
+            coverage["synced_start"] = backfill_before
+        if not coverage.get("synced_end") or backfill_after < coverage["synced_end"]:
+            coverage["synced_end"] = backfill_after
+    unsynced = sum(1 for calendar_id in cal_id_list if calendar_id not in sync_states)
+    if unsynced:
+        coverage["pending_calendars"] = coverage.get("pending_calendars", 0) + unsynced
     
     columns = [
         "id",
@@ -567,21 +617,17 @@ async def get_events(
         if not sub_id or not url:
             continue
         ics_calendar_id = f"ics:{sub_id}"
-        ics_events = await _fetch_ics_events(url, start_dt, end_dt, ics_calendar_id)
+        ics_events = _fetch_ics_events(url, start_dt, end_dt, ics_calendar_id)
         events.extend(ics_events)
     
     return {"events": events, "coverage": coverage, "calendars": calendars, "last_synced_at": last_synced_at}
 
 @router.post("/events")
-async def create_event(
-    request: Request,
+def create_event(
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    try:
-        body = await request.json()
-    except ClientDisconnect:
-        raise HTTPException(status_code=400, detail="Client disconnected")
     google_calendar_id = body.get("calendar_id", "primary")
     account_email = body.get("account_email")
     event_data = body.get("event_data")
@@ -626,7 +672,7 @@ async def create_event(
     google_event = service.create_event(google_calendar_id, event_data, send_notifications)
     
     sync_service = CalendarSyncService(str(user.id), calendar.get("external_account_id") or user.email, supabase)
-    sync_service.save_event(google_event, calendar["id"])
+    sync_service.save_event(google_event, calendar["id"], change_type="created")
     
     recurrence = google_event.get("recurrence") or []
     if recurrence:
@@ -651,24 +697,25 @@ async def create_event(
 
         sync_start = start_dt - timedelta(days=7)
         sync_end = end_dt + timedelta(days=365)
-        def _background_sync():
-            try:
-                sync_service.sync_date_range(calendar["id"], google_calendar_id, sync_start, sync_end)
-            except Exception as e:
-                pass
-        threading.Thread(target=_background_sync, daemon=True).start()
+        # Only the new series' occurrences can have changed; skip the rest of the calendar.
+        sync_scheduler.submit(
+            ("instances", str(user.id), google_event["id"]),
+            str(user.id),
+            "instance_sync",
+            lambda: sync_service.sync_event_instances(calendar["id"], google_calendar_id, google_event["id"], sync_start, sync_end),
+            PRIORITY_BACKGROUND
+        )
 
     google_event["calendar_id"] = calendar_id
     return {"event": google_event}
 
 @router.put("/events/{event_id}")
-async def update_event(
+def update_event(
     event_id: str,
-    request: Request,
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    body = await request.json()
     calendar_id = body.get("calendar_id", "primary")
     event_data = body.get("event_data")
     event_data = _normalize_event_location(event_data)
@@ -754,13 +801,12 @@ async def update_event(
     return {"event": updated_event}
 
 @router.patch("/events/{event_id}")
-async def patch_event(
+def patch_event(
     event_id: str,
-    request: Request,
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    body = await request.json()
     calendar_id = body.get("calendar_id", "primary")
     event_data = body.get("event_data")
     event_data = _normalize_event_location(event_data)
@@ -844,7 +890,7 @@ async def patch_event(
     return {"event": patched_event}
 
 @router.delete("/events/{event_id}")
-async def delete_event(
+def delete_event(
     event_id: str,
     calendar_id: str = Query("primary"),
     account_email: Optional[str] = Query(None),
@@ -934,13 +980,12 @@ async def delete_event(
     return {"message": "Event deleted successfully"}
 
 @router.post("/events/{event_id}/respond")
-async def respond_to_event(
+def respond_to_event(
     event_id: str,
-    request: Request,
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    body = await request.json()
     response_status = body.get("response_status")
     calendar_id = body.get("calendar_id", "primary")
 
@@ -980,23 +1025,56 @@ async def respond_to_event(
     return {"event": updated_event}
 
 @router.post("/sync")
-async def sync_calendar(
-    request: Request,
+def sync_calendar(
+    body: dict = Depends(get_optional_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    try:
-        body = await request.json()
-    except Exception:
-        body = {}
-    
     initial_backfill = body.get("initial_backfill", False)
     force_full = body.get("force_full", False)
     foreground = bool(body.get("foreground", False))
     
-    def _run_sync():
+    def _resolve_calendars(bg_supabase, external_account_id):
         import time
-        from db.supabase_client import get_supabase_client
+        sync_service = CalendarSyncService(str(user.id), external_account_id, bg_supabase)
+        calendar_list = None
+        for attempt in range(3):
+            try:
+                with google_sync_slot(str(user.id), external_account_id):
+                    calendar_list = sync_service.sync_calendar_list()
+                break
+            except Exception as e:
+                if attempt < 2 and is_connection_error(e):
+                    recycle_supabase_client(sync_service.supabase)
+                    time.sleep(1)
+                    continue
+                raise
+
+        targets = [
+            (sync_service, calendar_id, google_calendar_id)
+            for calendar_id, google_calendar_id in calendar_list["targets"]
+        ]
+
+        register_account_watches(sync_service)
+        if not foreground:
+            # Calendars with a live push channel are synced by their notifications,
+            # except for a low-frequency fallback in case the channel went quiet.
+            push_synced = push_synced_calendar_ids(str(user.id), bg_supabase)
+            targets = [target for target in targets if str(target[1]) not in push_synced]
+        return targets
+
+    def _delta_sync_calendar(sync_service, calendar_id, google_calendar_id):
+        # Takes the account's Google sync slot itself, after any shared-calendar wait.
+        return sync_calendar_for_subscribers(sync_service, calendar_id, google_calendar_id)
+
+    def _backfill_account(bg_supabase, external_account_id):
+        sync_service = CalendarSyncService(str(user.id), external_account_id, bg_supabase)
+        with google_sync_slot(str(user.id), external_account_id):
+            sync_service.backfill_calendar()
+        register_account_watches(sync_service)
+        return {"status": "completed"}
+
+    def _run_sync():
         bg_supabase = get_supabase_client()
 
         accounts_result = (
@@ -1006,68 +1084,114 @@ async def sync_calendar(
             .eq("provider", "google")
             .execute()
         )
-        accounts = accounts_result.data or []
-
-        if not accounts:
-            return
-
-        for account in accounts:
-            external_account_id = account.get("external_account_id")
-            if not external_account_id:
-                continue
-
-            try:
-                sync_service = CalendarSyncService(str(user.id), external_account_id, bg_supabase)
-                calendars = sync_service.google_service.list_calendars()
-
-                if not calendars:
-                    continue
-
-                for calendar in calendars:
-                    google_calendar_id = calendar.get("id")
-
-                    calendar_id = None
-                    for attempt in range(3):
-                        try:
-                            calendar_id = sync_service.get_calendar_id(calendar)
-                            break
-                        except HttpError as e:
-                            if attempt < 2 and "disconnected" in str(e).lower():
-                                time.sleep(1)
-                                continue
-                            raise
-
-                    if not calendar_id:
-                        continue
-
-                    if initial_backfill or force_full:
-                        try:
-                            sync_service.backfill_calendar()
-                        except Exception as e:
-                            pass
-                        continue
-
+        account_ids = [a.get("external_account_id") for a in accounts_result.data or [] if a.get("external_account_id")]
+
+        summary = {"accounts": len(account_ids), "calendars": 0, "succeeded": 0, "failed": 0, "errors": []}
+        if not account_ids:
+            return summary
+
+        workers = max(1, min(settings.SYNC_GLOBAL_CONCURRENCY, len(account_ids) * settings.SYNC_PER_ACCOUNT_CONCURRENCY))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calendar-sync") as pool:
+            if initial_backfill or force_full:
+                # backfill_calendar walks every calendar on the account itself.
+                futures = {pool.submit(_backfill_account, bg_supabase, account_id): (account_id, None) for account_id in account_ids}
+            else:
+                futures = {}
+                resolved = {pool.submit(_resolve_calendars, bg_supabase, account_id): account_id for account_id in account_ids}
+                for future in as_completed(resolved):
+                    account_id = resolved[future]
                     try:
-                        result = sync_service.delta_sync(calendar_id, google_calendar_id)
+                        targets = future.result()
                     except Exception as e:
-                        pass
-            except Exception as e:
-                pass
+                        summary["failed"] += 1
+                        summary["errors"].append({"account": account_id, "calendar": None, "error": str(e)})
+                        continue
+                    for sync_service, calendar_id, google_calendar_id in targets:
+                        future = pool.submit(_delta_sync_calendar, sync_service, calendar_id, google_calendar_id)
+                        futures[future] = (account_id, google_calendar_id)
+
+            for future in as_completed(futures):
+                account_id, google_calendar_id = futures[future]
+                summary["calendars"] += 1
+                try:
+                    result = future.result() or {}
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+                if result.get("status") != "error" and result.get("success", True):
+                    summary["succeeded"] += 1
+                    for key, value in result.items():
+                        if isinstance(value, int) and not isinstance(value, bool):
+                            summary[key] = summary.get(key, 0) + value
+                else:
+                    summary["failed"] += 1
+                    summary["errors"].append({"account": account_id, "calendar": google_calendar_id, "error": result.get("error")})
+
+        if summary["failed"]:
+            logger.warning("Sync for user %s finished with %d failures", user.id, summary["failed"])
+        return summary
     
+    mode = "full" if (initial_backfill or force_full) else "delta"
+    job = sync_scheduler.submit(
+        ("sync", str(user.id), mode),
+        str(user.id),
+        f"{mode}_sync",
+        _run_sync,
+        PRIORITY_INTERACTIVE if foreground else PRIORITY_BACKGROUND
+    )
+
     if foreground:
-        _run_sync()
-        return {"status": "completed", "message": "Sync completed"}
+        if not job.wait(settings.SYNC_FOREGROUND_TIMEOUT_SECONDS):
+            return JSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={"status": "running", "message": "Sync still running", "job": job.to_dict()}
+            )
+        if job.status == "error":
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Sync failed: {job.error}")
+        return {"status": "completed", "message": "Sync completed", "result": job.result}
+
+    return {"status": "started", "message": "Sync started in background", "job": job.to_dict()}
+
+@router.post("/notifications")
+def receive_google_notification(request: Request):
+    """Webhook for Google events.watch channels; authenticated by the per-channel token."""
+    headers = request.headers
+    outcome = handle_notification(
+        headers.get("X-Goog-Channel-ID"),
+        headers.get("X-Goog-Resource-ID"),
+        headers.get("X-Goog-Resource-State"),
+        headers.get("X-Goog-Channel-Token")
+    )
+    if outcome == "invalid_token":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid channel token")
+    # Anything else is acknowledged so Google does not redeliver.
+    return {"status": outcome}
 
-    threading.Thread(target=_run_sync, daemon=True).start()
-    return {"status": "started", "message": "Sync started in background"}
+@router.post("/watch")
+def watch_calendars(
+    user: User = Depends(get_current_user),
+    supabase: Client = Depends(get_supabase_client)
+):
+    accounts = (
+        supabase.table("calendar_accounts")
+        .select("external_account_id")
+        .eq("user_id", str(user.id))
+        .eq("provider", "google")
+        .execute()
+    ).data or []
+    registered = 0
+    for account in accounts:
+        if not account.get("external_account_id"):
+            continue
+        sync_service = CalendarSyncService(str(user.id), account["external_account_id"], supabase)
+        registered += register_account_watches(sync_service)
+    return {"registered": registered}
 
 @router.post("/add-account")
-async def add_account(
-    request: Request,
+def add_account(
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    body = await request.json()
     access_token = body.get("access_token")
     refresh_token = body.get("refresh_token")
     expires_at = body.get("expires_at")
@@ -1097,35 +1221,17 @@ async def add_account(
         payload["account_email"] = account_email.strip()
 
     supabase.table("calendar_accounts").upsert(payload, on_conflict="user_id,provider,external_account_id").execute()
+    invalidate_google_credentials(str(user.id), external_account_id)
 
-    if not payload.get("account_email"):
-        try:
-            svc = GoogleCalendarService(str(user.id), supabase, external_account_id)
-            calendars = svc.list_calendars()
-            primary_email = None
-            for cal in calendars or []:
-                if cal.get("primary") is True and isinstance(cal.get("id"), str) and "@" in cal.get("id"):
-                    primary_email = cal.get("id")
-                    break
-            if primary_email:
-                supabase.table("calendar_accounts").update({"account_email": primary_email}).eq("user_id", str(user.id)).eq("provider", "google").eq("external_account_id", external_account_id).execute()
-        except Exception as e:
-            pass
-    
     try:
-        svc = GoogleCalendarService(str(user.id), supabase, external_account_id)
-        calendars = svc.list_calendars()
         sync_service = CalendarSyncService(str(user.id), external_account_id, supabase)
-        for cal in calendars or []:
-            try:
-                sync_service.get_calendar_id(cal)
-            except Exception as e:
-                pass
+        primary_email = sync_service.sync_calendar_list()["primary_calendar_id"]
+        if not payload.get("account_email") and primary_email and "@" in primary_email:
+            supabase.table("calendar_accounts").update({"account_email": primary_email}).eq("user_id", str(user.id)).eq("provider", "google").eq("external_account_id", external_account_id).execute()
     except Exception as e:
         pass
 
     def _background_backfill():
-        from db.supabase_client import get_supabase_client
         bg_supabase = get_supabase_client()
         try:
             sync_service = CalendarSyncService(str(user.id), external_account_id, bg_supabase)
@@ -1147,8 +1253,15 @@ async def add_account(
             sync_service.backfill_calendar(before_ts, after_ts)
         except Exception as e:
             raise HTTPException(status_code=500, detail="Initial backfill failed")
+        register_account_watches(sync_service)
     
-    threading.Thread(target=_background_backfill, daemon=True).start()
+    sync_scheduler.submit(
+        ("backfill", str(user.id), external_account_id),
+        str(user.id),
+        "backfill",
+        _background_backfill,
+        PRIORITY_BACKFILL
+    )
     
     return JSONResponse(
         status_code=200,
@@ -1156,7 +1269,7 @@ async def add_account(
     )
 
 @router.get("/sync-status")
-async def get_sync_status(
+def get_sync_status(
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
@@ -1191,11 +1304,36 @@ async def get_sync_status(
     
     return {
         "sync_status": status_list,
-        "sync_state": combined_state
+        "sync_state": combined_state,
+        "jobs": sync_scheduler.jobs_for_user(str(user.id)),
+        "google_rate_limits": rate_limits_for_user(str(user.id))
+    }
+
+@router.get("/changes")
+def get_event_changes(
+    cursor: int = Query(0, ge=0, description="Return changes with an id greater than this cursor"),
+    limit: int = Query(500, ge=1, le=1000),
+    user: User = Depends(get_current_user),
+    supabase: Client = Depends(get_supabase_client)
+):
+    """Change feed written by sync; clients pass the returned cursor back on the next call."""
+    changes = (
+        supabase.table("event_changes")
+        .select("id,event_id,external_id,calendar_id,change_type,changed_fields,changed_at")
+        .eq("user_id", str(user.id))
+        .gt("id", cursor)
+        .order("id")
+        .limit(limit)
+        .execute()
+    ).data or []
+    return {
+        "changes": changes,
+        "cursor": changes[-1]["id"] if changes else cursor,
+        "has_more": len(changes) == limit
     }
 
 @router.get("/event-user-state")
-async def get_event_user_state(
+def get_event_user_state(
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
@@ -1229,15 +1367,11 @@ async def get_event_user_state(
     return {"states": normalized}
 
 @router.post("/event-user-state")
-async def update_event_user_state(
-    request: Request,
+def update_event_user_state(
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    try:
-        body = await request.json()
-    except ClientDisconnect:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Client disconnected")
     event_id = body.get("event_id")
     is_checked_off = body.get("is_checked_off", False)
     time_overrides = body.get("time_overrides")
@@ -1277,16 +1411,11 @@ async def update_event_user_state(
     return {"state": state_row or payload}
 
 @router.post("/event-user-state/batch")
-async def batch_update_event_user_state(
-    request: Request,
+def batch_update_event_user_state(
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    try:
-        body = await request.json()
-    except ClientDisconnect:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Client disconnected")
-    
     updates = body.get("updates", [])
     if not updates:
         return {"updated": 0}
@@ -1333,7 +1462,7 @@ async def batch_update_event_user_state(
     return {"updated": len(payloads)}
 
 @router.get("/todo-event-links")
-async def get_todo_event_links(
+def get_todo_event_links(
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
@@ -1341,15 +1470,11 @@ async def get_todo_event_links(
     return {"links": result.data or []}
 
 @router.post("/todo-event-links")
-async def update_todo_event_link(
-    request: Request,
+def update_todo_event_link(
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    try:
-        body = await request.json()
-    except ClientDisconnect:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Client disconnected during request")
     todo_id = body.get("todo_id")
     event_id = body.get("event_id")
     google_event_id = body.get("google_event_id")
@@ -1378,7 +1503,7 @@ async def update_todo_event_link(
         raise
 
 @router.delete("/todo-event-links/{todo_id}")
-async def delete_todo_event_link(
+def delete_todo_event_link(
     todo_id: str,
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Request, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
 from db.cerebras_client import get_async_cerebras_client, get_cerebras_client
 from db.supabase_client import get_supabase_client
 from db.auth_dependency import get_current_user
@@ -131,6 +132,7 @@ def list_events(args: dict, user: User, supabase: Client) -> dict:
                 .select("id")
                 .eq("user_id", str(user.id))
                 .eq("selected", True)
+                .eq("hidden", False)
                 .execute()
             )
             calendar_ids = [c.get("id") for c in (calendars_result.data or []) if c.get("id")]
@@ -235,7 +237,7 @@ def create_event(args: dict, user: User, supabase: Client) -> dict:
         event = service.create_event(provider, payload)
 
         syncer = CalendarSyncService(str(user.id), account or user.email, supabase)
-        syncer.save_event(event, calendar[0]["id"] if calendar else "primary")
+        syncer.save_event(event, calendar[0]["id"] if calendar else "primary", change_type="created")
 
         return {"event": event, "message": "Event created"}
     except Exception as e:
@@ -330,7 +332,7 @@ async def get_todo_suggestions(
 ):
     body = await request.json()
     user_prompt = body.get("content", "")
-    res = await asyncio.to_thread(lambda: supabase.table("categories").select("*").eq("user_id", str(user.id)).execute())
+    res = await run_in_threadpool(lambda: supabase.table("categories").select("*").eq("user_id", str(user.id)).execute())
     categories = res.data or []
 
     schema = {
@@ -486,7 +488,7 @@ async def chat_calendar(
             logger.warning(f"[CHAT] path=schedule_overview type={schedule_overview['type']}")
             
             _sb_t0 = time.perf_counter()
-            events_result = await asyncio.to_thread(
+            events_result = await run_in_threadpool(
                 list_events,
                 {"start_date": schedule_overview["start"].isoformat(), "end_date": schedule_overview["end"].isoformat()},
                 user,
@@ -536,7 +538,7 @@ Instructions:
 
             _sb_t0 = time.perf_counter()
             logger.warning("[PERF] Starting Supabase query...")
-            events_result = await asyncio.to_thread(
+            events_result = await run_in_threadpool(
                 list_events,
                 {"start_date": start.isoformat(), "end_date": end.isoformat(), "conditions": look_for_events},
                 user,
@@ -620,7 +622,7 @@ Instructions:
                 if name in functions:
                     _tool_t0 = time.perf_counter()
                     args = json.loads(call.function.arguments)
-                    res = await asyncio.to_thread(functions[name], args)
+                    res = await run_in_threadpool(functions[name], args)
                     _tool_dt = time.perf_counter() - _tool_t0
                     logger.warning(f"[PERF] iter={iteration} tool={name} time={_tool_dt:.3f}s")
                     
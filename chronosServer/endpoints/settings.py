@@ -1,6 +1,7 @@
-from fastapi import APIRouter, HTTPException, Request, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, status
 from db.supabase_client import get_supabase_client
 from db.auth_dependency import get_current_user
+from db.body_dependency import get_json_body
 from models.user import User
 from models.settings import UserSettings, UserSettingsUpdate
 from supabase import Client
@@ -48,7 +49,7 @@ def _strip_system_fields(payload: dict) -> dict:
     return payload
 
 @router.get("", response_model=UserSettings)
-async def get_settings(
+def get_settings(
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
@@ -65,16 +66,11 @@ async def get_settings(
     return UserSettings(**DEFAULT_SETTINGS)
 
 @router.put("", response_model=UserSettings)
-async def update_settings(
-    request: Request,
+def update_settings(
+    body: dict = Depends(get_json_body),
     user: User = Depends(get_current_user),
     supabase: Client = Depends(get_supabase_client)
 ):
-    try:
-        body = await request.json()
-    except Exception:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON")
-
     update_data = UserSettingsUpdate(**body)
     existing_result = (
         supabase.table("user_settings")
@@ -2,12 +2,12 @@ from fastapi import (
     APIRouter,
     HTTPException,
     Depends,
-    status,
-    Request
+    status
 )
 from fastapi.responses import JSONResponse
 from db.supabase_client import get_supabase_client
 from db.auth_dependency import get_current_user
+from db.body_dependency import get_json_body
 from db.google_credentials import GoogleCalendarService
 from supabase import Client
 from models.user import User
@@ -31,7 +31,7 @@ def _is_uuid(value) -> bool:
 
 
 @router.post("/")
-async def create_todo(
+def create_todo(
     todo: Todo,
     supabase: Client = Depends(get_supabase_client),
     user: User = Depends(get_current_user)
@@ -68,7 +68,7 @@ async def create_todo(
     )
 
 @router.get("/")
-async def get_todos(
+def get_todos(
     supabase: Client = Depends(get_supabase_client),
     user: User = Depends(get_current_user)
 ) -> JSONResponse:
@@ -107,7 +107,7 @@ async def get_todos(
     )
 
 @router.get("/bootstrap")
-async def bootstrap_todos(
+def bootstrap_todos(
     supabase: Client = Depends(get_supabase_client),
     user: User = Depends(get_current_user)
 ) -> JSONResponse:
@@ -144,7 +144,7 @@ async def bootstrap_todos(
         },
     )
 @router.put("/{todo_id}")
-async def edit_todo(
+def edit_todo(
     todo_id: UUID,
     todo_update: TodoUpdate,
     supabase: Client = Depends(get_supabase_client),
@@ -178,7 +178,7 @@ async def edit_todo(
 
 
 @router.patch("/{todo_id}/complete")
-async def complete(
+def complete(
     todo_id: str,
     is_completed: bool = False,
     supabase: Client = Depends(get_supabase_client),
@@ -208,7 +208,7 @@ async def complete(
 
 
 @router.delete("/{todo_id}")
-async def delete_todo(
+def delete_todo(
     todo_id: str,
     supabase: Client = Depends(get_supabase_client),
     user: User = Depends(get_current_user)
@@ -244,7 +244,7 @@ async def delete_todo(
 # --------- CATEGORIES ENDPOINTS --------------
 
 @router.delete("/categories/{category_id}")
-async def delete_category(
+def delete_category(
     category_id: str,
     supabase: Client = Depends(get_supabase_client),
     user: User = Depends(get_current_user)
@@ -276,7 +276,7 @@ async def delete_category(
         }
     )
 @router.post("/categories/")
-async def create_category(
+def create_category(
     category: Category, 
     supabase: Client = Depends(get_supabase_client),
     user: User = Depends(get_current_user)
@@ -310,7 +310,7 @@ async def create_category(
     )
 
 @router.get("/categories/")
-async def get_categories(
+def get_categories(
     supabase: Client = Depends(get_supabase_client),   
     user: User = Depends(get_current_user)
 ) -> JSONResponse:
@@ -338,7 +338,7 @@ async def get_categories(
     )
 
 @router.patch("/categories/batch-reorder")
-async def batch_reorder_categories(
+def batch_reorder_categories(
     payload: BatchCategoryReorder,
     supabase: Client = Depends(get_supabase_client),
     user: User = Depends(get_current_user)
@@ -390,7 +390,7 @@ async def batch_reorder_categories(
     )
 
 @router.patch("/categories/{category_id}")
-async def update_category(
+def update_category(
     category_id: str,
     category_update: CategoryUpdate,
     supabase: Client = Depends(get_supabase_client),
@@ -419,7 +419,7 @@ async def update_category(
     )
 
 @router.patch("/categories/{category_id}/assign-todo/{todo_id}")
-async def assign_todo_to_category(
+def assign_todo_to_category(
     category_id: str,
     todo_id: str,
     supabase: Client = Depends(get_supabase_client),
@@ -448,14 +448,13 @@ async def assign_todo_to_category(
 
 
 @router.post("/{todo_id}/convert-to-event")
-async def convert_todo_to_event(
+def convert_todo_to_event(
     todo_id: str,
-    request: Request,
+    body: dict = Depends(get_json_body),
     supabase: Client = Depends(get_supabase_client),
     user: User = Depends(get_current_user)
 ) -> JSONResponse:
     try:
-        body = await request.json()
         start_date = body.get("start_date")
         end_date = body.get("end_date")
         is_all_day = body.get("is_all_day", False)
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -6,14 +7,36 @@ from endpoints.todos import router as todo_router
 from endpoints.calendar import router as calendar_router
 from endpoints.settings import router as settings_router
 from endpoints.chat import router as chat_router
+from db.supabase_client import recycle_supabase_client
+from db.watch_channels import schedule_channel_renewal, watching_enabled
 from config import settings
+import anyio.to_thread
+import asyncio
+import httpx
 import logging
 
 # Configure logging - reduce noise from httpx
 logging.basicConfig(level=logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-app = FastAPI(title="Chronos API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync route handlers and blocking Supabase/Google calls share this bounded pool.
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.API_THREADPOOL_SIZE
+    renewal_task = asyncio.create_task(_renew_watch_channels()) if watching_enabled() else None
+    yield
+    if renewal_task:
+        renewal_task.cancel()
+
+
+async def _renew_watch_channels():
+    while True:
+        schedule_channel_renewal()
+        await asyncio.sleep(settings.GOOGLE_WATCH_RENEWAL_INTERVAL_SECONDS)
+
+
+app = FastAPI(title="Chronos API", lifespan=lifespan)
 allowed_origins = sorted(
     {
         "http://localhost:5174",
@@ -47,3 +70,13 @@ async def http_exception_handler(request: Request, exc: HTTPException):
         status_code=exc.status_code,
         content={"detail": exc.detail},
     )
+
+@app.exception_handler(httpx.TransportError)
+async def transport_error_handler(request: Request, exc: httpx.TransportError):
+    # A broken pooled connection surfaces here; recycle so the next request reconnects.
+    recycle_supabase_client()
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable. Please retry."},
+        headers={"Retry-After": "1"},
+    )
@@ -0,0 +1,15 @@
+-- Change feed appended by CalendarSyncService.publish_changes.
+-- Clients page on the bigserial id (GET /calendar/changes?cursor=<id>), which the
+-- database assigns at insert time; changed_at is informational only.
+create table if not exists event_changes (
+    id bigserial primary key,
+    user_id uuid not null,
+    calendar_id uuid,
+    event_id uuid,
+    external_id text,
+    change_type text not null check (change_type in ('created', 'updated', 'cancelled')),
+    changed_fields text[],
+    changed_at timestamptz not null default now()
+);
+
+create index if not exists event_changes_user_id_id_idx on event_changes (user_id, id);
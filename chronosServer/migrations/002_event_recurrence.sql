@@ -0,0 +1,4 @@
+-- Full recurrence array and the master's start time zone, so instances can be
+-- re-expanded from the database with EXDATE/RDATE lines and correct DST shifts.
+alter table events add column if not exists recurrence jsonb;
+alter table events add column if not exists start_time_zone text;
@@ -0,0 +1,3 @@
+-- Calendars that left the Google calendar list (deleted or hidden there) are
+-- marked hidden instead of deleted, keeping color, selection and events.
+alter table connected_calendars add column if not exists hidden boolean not null default false;
@@ -0,0 +1,3 @@
+-- calendarList sync token per account; sync_calendar_list falls back to a full
+-- listing when this column is absent.
+alter table calendar_accounts add column if not exists calendar_list_sync_token text;
@@ -0,0 +1,3 @@
+-- Marks the account's primary calendar so its id (the account email) can be
+-- read from stored rows when the calendar list is synced incrementally.
+alter table connected_calendars add column if not exists is_primary boolean not null default false;
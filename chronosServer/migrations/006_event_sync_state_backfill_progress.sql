@@ -0,0 +1,3 @@
+-- Checkpoint of an interrupted range sync: completed spans, in-flight page
+-- tokens and observed event density. Cleared once the backfill finishes.
+alter table event_sync_state add column if not exists backfill_progress jsonb;
@@ -0,0 +1,8 @@
+-- One row per background task that a single API worker should run at a time
+-- (currently watch channel renewal). A worker holds the task while
+-- claimed_until is in the future and extends it on every run.
+create table if not exists background_task_claims (
+    task text primary key,
+    claimed_by text,
+    claimed_until timestamptz not null default now()
+);
@@ -0,0 +1,16 @@
+-- Google push channels opened by db/watch_channels.register_calendar_watch.
+-- Notifications are matched on channel_id and verified against token;
+-- renewal scans by expiration and registration replaces by (user_id, calendar_id).
+create table if not exists calendar_watch_channels (
+    channel_id text primary key,
+    token text not null,
+    resource_id text,
+    user_id uuid not null,
+    external_account_id text,
+    calendar_id uuid not null,
+    provider_calendar_id text not null,
+    expiration timestamptz
+);
+
+create index if not exists calendar_watch_channels_user_id_calendar_id_idx on calendar_watch_channels (user_id, calendar_id);
+create index if not exists calendar_watch_channels_expiration_idx on calendar_watch_channels (expiration);
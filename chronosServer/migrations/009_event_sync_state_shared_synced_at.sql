@@ -0,0 +1,3 @@
+-- Set on a subscriber's sync state when a peer's delta sync of the same shared
+-- Google calendar was fanned out to it; concurrent syncs skip while it is fresh.
+alter table event_sync_state add column if not exists shared_synced_at timestamptz;